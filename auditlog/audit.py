@@ -0,0 +1,58 @@
+from django.db import transaction
+
+from contextlib import contextmanager
+import threading
+
+from .models import AuditLog
+
+
+_state = threading.local()
+
+
+def _buffer():
+    return getattr(_state, 'buffer', None)
+
+
+def _add(auditlog):
+    buffer = _buffer()
+    if buffer is None:
+        auditlog.save()
+    else:
+        buffer.append(auditlog)
+
+
+def record(actor, action, obj, summary=None):
+    """Record an audit event about obj.
+
+       Within bulk() (every request with AuditLogMiddleware) the event is buffered and written with the others in one insert,
+       otherwise it is written straight away. Events recorded in a transaction are dropped if the transaction is rolled back.
+    """
+    auditlog = AuditLog.for_object(obj, actor, action, summary)
+    transaction.on_commit(lambda: _add(auditlog))
+    return auditlog
+
+
+def flush():
+    """Write the buffered events."""
+    buffer = _buffer()
+    if buffer:
+        AuditLog.objects.bulk_create(buffer, batch_size=500)
+        del buffer[:]
+
+
+@contextmanager
+def bulk():
+    """Buffer the events recorded within the block and write them together at the end, e.g. in management commands."""
+    depth = getattr(_state, 'depth', 0)
+    if depth == 0:
+        _state.buffer = []
+    _state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.depth = depth
+        if depth == 0:
+            try:
+                flush()
+            finally:
+                _state.buffer = None
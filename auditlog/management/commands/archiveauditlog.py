@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from datetime import timedelta
+import gzip
+import json
+import os
+
+from auditlog.models import AuditLog
+
+class Command(BaseCommand):
+    """ python manage.py archiveauditlog """
+
+    help = 'Move audit log entries older than the retention period into monthly gzipped JSON lines files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'AUDITLOG_RETENTION_DAYS', 365))
+        parser.add_argument('--output-dir', type=str, default=getattr(settings, 'AUDITLOG_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'auditlog-archive')))
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        before = timezone.now() - timedelta(days=options['days'])
+        no_of_entries_archived = 0
+        while True:
+            with transaction.atomic():
+                auditlogs = list(AuditLog.objects.filter(time__lt=before).select_related('content_type').order_by('time', 'id')[:options['batch_size']])
+                if not auditlogs:
+                    break
+                self._write(auditlogs, options['output_dir'])
+                AuditLog.objects.filter(id__in=[auditlog.id for auditlog in auditlogs]).delete()
+            no_of_entries_archived += len(auditlogs)
+        self.stdout.write('Archived {} audit log entr{}.'.format(no_of_entries_archived, 'y' if no_of_entries_archived == 1 else 'ies'))
+
+    def _write(self, auditlogs, output_dir):
+        """Append entries to the file of the month they were recorded in, appended gzip members are read as one file."""
+        lines = {}
+        for auditlog in auditlogs:
+            lines.setdefault(auditlog.time.strftime('%Y-%m'), []).append(json.dumps({
+                'id': auditlog.id,
+                'time': auditlog.time.isoformat(),
+                'actor': auditlog.actor,
+                'action': auditlog.action,
+                'app': auditlog.app,
+                'summary': auditlog.summary,
+                'content_type': '{}.{}'.format(auditlog.content_type.app_label, auditlog.content_type.model),
+                'object_id': auditlog.object_id,
+            }))
+        for month, month_lines in lines.items():
+            with gzip.open(os.path.join(output_dir, 'auditlog-{}.jsonl.gz'.format(month)), 'at', encoding='utf-8') as archive_file:
+                archive_file.write('\n'.join(month_lines) + '\n')
@@ -0,0 +1,12 @@
+from . import audit
+
+
+class AuditLogMiddleware:
+    """Write the audit events recorded during a request in one insert when the request ends."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit.bulk():
+            return self.get_response(request)
@@ -0,0 +1,74 @@
+# Generated by Django 2.2.5 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+FEEDBACK_ACTIONS = {
+    'create': 'created',
+    'edit': 'edited',
+    'delet': 'deleted',
+}
+
+
+def denormalise_auditlog(apps, schema_editor):
+    AuditLog = apps.get_model('auditlog', 'AuditLog')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    FeedbackAuditLog = apps.get_model('feedback', 'FeedbackAuditLog')
+
+    try:
+        content_type = ContentType.objects.get(app_label='feedback', model='feedbackauditlog')
+    except ContentType.DoesNotExist:
+        return
+    feedback_auditlogs = FeedbackAuditLog.objects.in_bulk(AuditLog.objects.filter(content_type=content_type).values_list('object_id', flat=True))
+    auditlogs = []
+    for auditlog in AuditLog.objects.filter(content_type=content_type).iterator():
+        feedback_auditlog = feedback_auditlogs.get(auditlog.object_id)
+        if feedback_auditlog is None:
+            continue
+        auditlog.actor = feedback_auditlog.user
+        auditlog.action = feedback_auditlog.action
+        auditlog.app = 'feedback'
+        auditlog.summary = '{} {} a feedback response'.format(feedback_auditlog.user, FEEDBACK_ACTIONS.get(feedback_auditlog.action, feedback_auditlog.action))
+        auditlogs.append(auditlog)
+    AuditLog.objects.bulk_update(auditlogs, ['actor', 'action', 'app', 'summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('feedback', '0008_feedback_uuid'),
+        ('auditlog', '0003_auto_20181005_1525'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='actor',
+            field=models.CharField(blank=True, default='', max_length=150),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='app',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='summary',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['time', 'app'], name='auditlog_au_time_538e8c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['actor', 'time'], name='auditlog_au_actor_9fdf94_idx'),
+        ),
+        migrations.RunPython(denormalise_auditlog, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,47 @@
 from django.db import models
+from django.utils import timezone
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
 
 class AuditLog(models.Model):
-    time = models.DateTimeField(auto_now_add=True)
+    # Set when the event is recorded rather than when a buffered event is written
+    time = models.DateTimeField(default=timezone.now)
+
+    # Denormalised when the event is recorded, so listing and filtering never join the source tables
+    actor = models.CharField(max_length=150, blank=True, default='')
+    action = models.CharField(max_length=20, blank=True, default='')
+    app = models.CharField(max_length=50, blank=True, default='')
+    summary = models.CharField(max_length=255, blank=True, default='')
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['time', 'app']),
+            models.Index(fields=['actor', 'time']),
+        ]
+
+    @classmethod
+    def for_object(cls, content_object, actor, action, summary=None):
+        """Build an unsaved audit log entry, the summary defaults to the content object's auditlog_summary() or str()."""
+        if summary is None:
+            summary = content_object.auditlog_summary() if hasattr(content_object, 'auditlog_summary') else str(content_object)
+        return cls(
+            content_object=content_object,
+            actor=actor,
+            action=action,
+            app=content_object._meta.app_label,
+            summary=summary[:255],
+        )
+
     def __str__(self):
+        if self.summary:
+            return '{} at {}'.format(self.summary, self.time)
+        # Content objects can describe themselves with the time of this row to avoid querying it back
+        if hasattr(self.content_object, 'auditlog_str'):
+            return self.content_object.auditlog_str(self.time)
         return str(self.content_object)
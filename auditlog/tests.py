@@ -1,3 +1,128 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.core.management import call_command
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+from io import StringIO
+import gzip
+import json
+import os
+import tempfile
+
+from feedback.models import Feedback, Category, FeedbackAuditLog
+
+from .models import AuditLog
+from . import audit
+
+class AuditLogViewTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', email='admin@example.com', password='password')
+        self.feedback = Feedback.objects.create(message='Feedback 01', category=Category.objects.create(name='Others'))
+
+    def _create_auditlog(self, n):
+        for i in range(n):
+            feedback_auditlog = FeedbackAuditLog.objects.create(action='edit', user='user{}'.format(i), feedback=self.feedback)
+            AuditLog.for_object(feedback_auditlog, feedback_auditlog.user, feedback_auditlog.action).save()
+
+    def _count_view_queries(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('auditlog:view'))
+        self.assertEqual(response.status_code, 200)
+        # Test the source tables are not queried
+        self.assertFalse([query for query in queries if 'feedback_' in query['sql']])
+        return len(queries)
+
+    def test_auditlog_str(self):
+        self._create_auditlog(1)
+        auditlog = AuditLog.objects.get()
+        self.assertEqual(str(auditlog), 'user0 edited a feedback response at {}'.format(auditlog.time))
+        self.assertEqual(str(auditlog), str(auditlog.content_object))
+
+    def test_view_query_count(self):
+        self._create_auditlog(2)
+        no_of_queries = self._count_view_queries()
+        self._create_auditlog(30)
+        self.assertEqual(self._count_view_queries(), no_of_queries)
+
+
+class DenormalisedAuditLogTestCase(TestCase):
+
+    def setUp(self):
+        self.feedback = Feedback.objects.create(message='Feedback 01', category=Category.objects.create(name='Others'))
+
+    def _record(self, user, action):
+        feedback_auditlog = FeedbackAuditLog.objects.create(action=action, user=user, feedback=self.feedback)
+        auditlog = AuditLog.for_object(feedback_auditlog, user, action)
+        auditlog.save()
+        return auditlog
+
+    def test_for_object(self):
+        auditlog = self._record('user01', 'create')
+        self.assertEqual((auditlog.actor, auditlog.action, auditlog.app), ('user01', 'create', 'feedback'))
+        self.assertEqual(str(auditlog), 'user01 created a feedback response at {}'.format(auditlog.time))
+
+        # Test rendering does not touch the source table
+        auditlog = AuditLog.objects.get()
+        with self.assertNumQueries(0):
+            str(auditlog)
+
+    def test_archive(self):
+        old_auditlog = self._record('user01', 'create')
+        AuditLog.objects.filter(pk=old_auditlog.pk).update(time=timezone.now() - timedelta(days=400))
+        old_auditlog.refresh_from_db()
+        self._record('user02', 'edit')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            out = StringIO()
+            call_command('archiveauditlog', days=365, output_dir=output_dir, stdout=out)
+            self.assertEqual(out.getvalue().strip(), 'Archived 1 audit log entry.')
+            self.assertEqual(list(AuditLog.objects.values_list('actor', flat=True)), ['user02'])
+
+            archive_file_name = os.path.join(output_dir, 'auditlog-{}.jsonl.gz'.format(old_auditlog.time.strftime('%Y-%m')))
+            with gzip.open(archive_file_name, 'rt', encoding='utf-8') as archive_file:
+                entries = [json.loads(line) for line in archive_file]
+            self.assertEqual(len(entries), 1)
+            self.assertEqual(entries[0]['actor'], 'user01')
+            self.assertEqual(entries[0]['summary'], 'user01 created a feedback response')
+            self.assertEqual(entries[0]['content_type'], 'feedback.feedbackauditlog')
+
+
+# Events are recorded on transaction commit, which TestCase never does
+class AuditTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.feedback = Feedback.objects.create(message='Feedback 01', category=Category.objects.create(name='Others'))
+
+    def test_record(self):
+        # Test written straight away outside bulk mode
+        audit.record('user01', 'edit', self.feedback, 'user01 edited a feedback response')
+        auditlog = AuditLog.objects.get()
+        self.assertEqual((auditlog.actor, auditlog.action, auditlog.app, auditlog.content_object), ('user01', 'edit', 'feedback', self.feedback))
+
+    def test_bulk(self):
+        with audit.bulk():
+            for i in range(10):
+                audit.record('user{}'.format(i), 'edit', self.feedback)
+            self.assertEqual(AuditLog.objects.count(), 0)
+            with CaptureQueriesContext(connection) as queries:
+                audit.flush()
+            self.assertEqual(len([query for query in queries if query['sql'].startswith('INSERT')]), 1)
+        self.assertEqual(AuditLog.objects.count(), 10)
+        # Test default summary and times kept in recording order
+        auditlogs = list(AuditLog.objects.order_by('id'))
+        self.assertEqual(auditlogs[0].summary, 'Feedback 01')
+        self.assertEqual(auditlogs, sorted(auditlogs, key=lambda auditlog: auditlog.time))
+
+    def test_respond(self):
+        user = User.objects.create_superuser(username='admin', email='admin@example.com', password='password')
+        self.client.force_login(user)
+        response = self.client.post(reverse('feedback:respond', kwargs={'feedback_uuid': self.feedback.uuid}), {'message': 'Response 01', 'submit': 'Submit'})
+        self.assertRedirects(response, reverse('feedback:view'), fetch_redirect_response=False)
+        self.assertEqual(list(AuditLog.objects.values_list('summary', flat=True)), ['admin created a feedback response'])
+        self.assertFalse(FeedbackAuditLog.objects.exists())
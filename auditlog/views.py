@@ -2,12 +2,20 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, permission_required
 
 from .models import AuditLog
+from website.pagination import keyset_paginate
 
 @login_required
 @permission_required('auditlog.view_auditlog', raise_exception=True)
 def view(request):
-    auditlog = AuditLog.objects.all().order_by('-time', '-id')
+    # Rows are shown with their denormalised summary, so the source tables are never queried
+    auditlog = AuditLog.objects.all()
+    # Filter on the denormalised columns
+    if request.GET.get('actor'):
+        auditlog = auditlog.filter(actor=request.GET['actor'])
+    if request.GET.get('app'):
+        auditlog = auditlog.filter(app=request.GET['app'])
+    page = keyset_paginate(auditlog, ('time', 'id'), 50, before=request.GET.get('before'), after=request.GET.get('after'))
     context = {
-        'auditlog': auditlog,
+        'auditlog': page,
     }
     return render(request, 'auditlog/view.html', context)
@@ -68,9 +68,12 @@ INSTALLED_APPS = [
     'jumpstart.apps.JumpstartConfig',
     'shop.apps.ShopConfig',
     'election.apps.ElectionConfig',
+    'performance.apps.PerformanceConfig',
 ]
 
 MIDDLEWARE = [
+    # First, so it measures the whole request
+    'performance.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,13 +81,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'auditlog.middleware.AuditLogMiddleware',
 ]
 
 ROOT_URLCONF = 'ecssweb.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates timing the rendering for PerformanceMiddleware
+        'BACKEND': 'performance.backends.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -112,6 +117,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.0/topics/cache/
+# The local memory cache is per process, use a shared cache (e.g. memcached) when running multiple workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Public pages of the website are cached for anonymous users in this cache until committee, societies or sponsors change,
+# e.g. a FileBasedCache or a Redis cache shared by all the processes. Clear it after deploying template changes.
+WEBSITE_PAGE_CACHE = 'default'
+
+WEBSITE_PAGE_CACHE_TIMEOUT = 86400
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
@@ -161,37 +184,77 @@ LOGOUT_REDIRECT_URL = 'ecsswebauth:auth'
 
 # Messages
 
-MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
+# Messages are kept in a cookie and only fall back to the session when they do not fit,
+# so adding a message does not force a session write.
+# Use 'django.contrib.messages.storage.session.SessionStorage' with the 'db' sessions profile to keep the old behaviour.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.fallback.FallbackStorage'
 
 
 # Sessions
+# https://docs.djangoproject.com/en/2.0/topics/http/sessions/#configuring-the-session-engine
+#
+# Supported profiles:
+#   - 'django.contrib.sessions.backends.db': every request reads the django_session table
+#   - 'django.contrib.sessions.backends.cached_db': reads are served from CACHES, writes go through to the database
+#   - 'django.contrib.sessions.backends.signed_cookies': no server side storage, sessions are signed with SECRET_KEY
+#
+# Compare them with `python manage.py benchmarksessions`.
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 SESSION_COOKIE_SECURE = False
 
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
+# Number of expired sessions deleted per transaction by `python manage.py clearexpiredsessions`
+SESSION_CLEAR_BATCH_SIZE = 500
+
 
 # Logging
-# LOGGING = {
-#     'version': 1,
-#     'disable_existing_loggers': False,
-#     'handlers': {
-#         'console': {
-#             'class': 'logging.StreamHandler',
-#         },
-#     'mail_admins': {
-#         'level': 'ERROR',
-#         'class': 'django.utils.log.AdminEmailHandler',
-#     },
-# },
-# 'loggers': {
-#     'django': {
-#         'handlers': ['console', 'mail_admins'],
-#             'level': 'WARN',
-#             'propagate': True,
-#         },
-#     },
-# }
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_true': {
+            '()': 'django.utils.log.RequireDebugTrue',
+        },
+    },
+    'handlers': {
+        'console': {
+            'filters': ['require_debug_true'],
+            'class': 'logging.StreamHandler',
+        },
+        'performance_console': {
+            'class': 'logging.StreamHandler',
+        },
+        'mail_admins': {
+            'level': 'ERROR',
+            'class': 'django.utils.log.AdminEmailHandler',
+        },
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['console', 'mail_admins'],
+            'level': 'WARN',
+            'propagate': True,
+        },
+        # A line of JSON per request, set the level to INFO to log them
+        'performance': {
+            'handlers': ['performance_console'],
+            'level': 'WARN',
+            'propagate': False,
+        },
+    },
+}
+
+# Seconds between writes of each process's request totals to the performance dashboard's tables, written after a response is sent
+PERFORMANCE_FLUSH_INTERVAL = 60
+
+# Record the call site of each query to warn about queries repeated in a request, e.g. lazy loading in a template loop
+PERFORMANCE_RECORD_QUERIES = DEBUG
+
+# Queries of the same shape run more times than this in a request are logged as warnings
+PERFORMANCE_REPEATED_QUERY_THRESHOLD = 5
 
 
 # Static files (CSS, JavaScript, Images)
@@ -201,10 +264,22 @@ STATIC_URL = '/static/'
 
 STATIC_ROOT = ''
 
+# Hashed file names and compressed copies of the static files, see README
+STATICFILES_STORAGE = 'website.storage.OptimisedManifestStaticFilesStorage'
+
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploaded images are scaled down to fit in this many pixels
+IMAGE_MAX_DIMENSION = 2048
+
+# Widths of the resized copies of uploaded images used in srcset
+IMAGE_RENDITION_WIDTHS = (400, 800)
+
+# Threads generating the resized copies after upload, 0 to generate them during the request
+IMAGE_WORKERS = 2
+
 
 # SAML
 
@@ -220,6 +295,17 @@ FB_PAGE_ID = ''
 
 FB_ACCESS_TOKEN = ''
 
+# Seconds to wait for each Graph API request, failed requests are retried 3 times
+FB_GRAPH_API_TIMEOUT = 10
+
+# Seconds the upcoming events are cached for, syncing invalidates the cache earlier
+FB_EVENTS_CACHE_TIMEOUT = 3600
+
+# Download event covers into MEDIA_ROOT and serve resized copies instead of hot-linking Facebook
+FB_EVENTS_MIRROR_COVERS = True
+
+FB_EVENTS_MIRROR_WORKERS = 4
+
 
 # Face Detection
 
@@ -227,6 +313,31 @@ FACE_DETECT_ENABLED = False
 
 FACE_DETECT_API = ''
 
+# Feedback
+
+# Key used to hash the IP addresses of feedback submissions, SECRET_KEY is used if empty
+FEEDBACK_IP_HASH_KEY = ''
+
+# PBKDF2 iterations of the IP address hash
+FEEDBACK_IP_HASH_ITERATIONS = 1
+
+# Also match IP addresses recorded with the old 100 rounds SHA-512 hash, which costs 100 hashes per request,
+# only set to True for the first 24 hours after upgrading, older records no longer count towards the limit
+FEEDBACK_IP_HASH_LEGACY = False
+
+# Where submissions are counted for the daily limit, 'database' or 'cache'
+# Expired database records are cleared by `python manage.py clearsubmittedips`
+FEEDBACK_RATE_LIMIT_BACKEND = 'database'
+
+
+# Auditlog
+
+# Entries older than this are moved to AUDITLOG_ARCHIVE_DIR by `python manage.py archiveauditlog`
+AUDITLOG_RETENTION_DAYS = 365
+
+AUDITLOG_ARCHIVE_DIR = os.path.join(BASE_DIR, 'auditlog-archive')
+
+
 # Shop
 
 SHOP_STRIPE_API_KEY = ''
@@ -0,0 +1,347 @@
+"""
+Django settings for ecssweb project.
+
+Generated by 'django-admin startproject' using Django 2.0.5.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.0/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.0/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_URL = "http://localhost:8000"
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.0/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'secret_key'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+
+SERVER_EMAIL = 'ecssweb@example.com'
+EMAIL_SUBJECT_PREFIX = '[ECSSWEB] '
+
+
+ADMINS = [('Example', 'example@example.com')]
+
+
+ALLOWED_HOSTS = ['localhost']
+
+
+# Sites
+SITE_ID = 1
+
+
+# Set to None to use session-based CSRF cookies
+# https://docs.djangoproject.com/en/2.0/ref/settings/#csrf-cookie-age
+CSRF_COOKIE_AGE = None
+
+CSRF_COOKIE_SECURE = False
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django.contrib.sites',
+    'django.contrib.sitemaps',
+    'website.apps.WebsiteConfig',
+    'ecsswebauth.apps.EcsswebauthConfig',
+    'ecsswebadmin.apps.EcsswebadminConfig',
+    'portal.apps.PortalConfig',
+    'feedback.apps.FeedbackConfig',
+    'auditlog.apps.AuditlogConfig',
+    'fbevents.apps.FbeventsConfig',
+    'jumpstart.apps.JumpstartConfig',
+    'shop.apps.ShopConfig',
+    'election.apps.ElectionConfig',
+    'performance.apps.PerformanceConfig',
+]
+
+MIDDLEWARE = [
+    # First, so it measures the whole request
+    'performance.middleware.PerformanceMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'auditlog.middleware.AuditLogMiddleware',
+]
+
+ROOT_URLCONF = 'ecssweb.urls'
+
+TEMPLATES = [
+    {
+        # DjangoTemplates timing the rendering for PerformanceMiddleware
+        'BACKEND': 'performance.backends.TimedDjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'ecssweb.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.0/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.0/topics/cache/
+# The local memory cache is per process, use a shared cache (e.g. memcached) when running multiple workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Public pages of the website are cached for anonymous users in this cache until committee, societies or sponsors change,
+# e.g. a FileBasedCache or a Redis cache shared by all the processes. Clear it after deploying template changes.
+WEBSITE_PAGE_CACHE = 'default'
+
+WEBSITE_PAGE_CACHE_TIMEOUT = 86400
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.0/topics/i18n/
+
+LANGUAGE_CODE = 'en-gb'
+
+TIME_ZONE = 'Europe/London'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Auth
+
+AUTHENTICATION_BACKENDS = [
+    'ecsswebauth.backends.SamlBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+LOGIN_REDIRECT_URL = 'portal:overview'
+
+LOGIN_URL = 'ecsswebauth:auth'
+
+LOGOUT_REDIRECT_URL = 'ecsswebauth:auth'
+
+
+# Messages
+
+# Messages are kept in a cookie and only fall back to the session when they do not fit,
+# so adding a message does not force a session write.
+# Use 'django.contrib.messages.storage.session.SessionStorage' with the 'db' sessions profile to keep the old behaviour.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.fallback.FallbackStorage'
+
+
+# Sessions
+# https://docs.djangoproject.com/en/2.0/topics/http/sessions/#configuring-the-session-engine
+#
+# Supported profiles:
+#   - 'django.contrib.sessions.backends.db': every request reads the django_session table
+#   - 'django.contrib.sessions.backends.cached_db': reads are served from CACHES, writes go through to the database
+#   - 'django.contrib.sessions.backends.signed_cookies': no server side storage, sessions are signed with SECRET_KEY
+#
+# Compare them with `python manage.py benchmarksessions`.
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+SESSION_COOKIE_SECURE = False
+
+SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+
+# Number of expired sessions deleted per transaction by `python manage.py clearexpiredsessions`
+SESSION_CLEAR_BATCH_SIZE = 500
+
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_true': {
+            '()': 'django.utils.log.RequireDebugTrue',
+        },
+    },
+    'handlers': {
+        'console': {
+            'filters': ['require_debug_true'],
+            'class': 'logging.StreamHandler',
+        },
+        'performance_console': {
+            'class': 'logging.StreamHandler',
+        },
+        'mail_admins': {
+            'level': 'ERROR',
+            'class': 'django.utils.log.AdminEmailHandler',
+        },
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['console', 'mail_admins'],
+            'level': 'WARN',
+            'propagate': True,
+        },
+        # A line of JSON per request, set the level to INFO to log them
+        'performance': {
+            'handlers': ['performance_console'],
+            'level': 'WARN',
+            'propagate': False,
+        },
+    },
+}
+
+# Seconds between writes of each process's request totals to the performance dashboard's tables, written after a response is sent
+PERFORMANCE_FLUSH_INTERVAL = 60
+
+# Record the call site of each query to warn about queries repeated in a request, e.g. lazy loading in a template loop
+PERFORMANCE_RECORD_QUERIES = DEBUG
+
+# Queries of the same shape run more times than this in a request are logged as warnings
+PERFORMANCE_REPEATED_QUERY_THRESHOLD = 5
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.0/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATIC_ROOT = ''
+
+# Hashed file names and compressed copies of the static files, see README
+STATICFILES_STORAGE = 'website.storage.OptimisedManifestStaticFilesStorage'
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Uploaded images are scaled down to fit in this many pixels
+IMAGE_MAX_DIMENSION = 2048
+
+# Widths of the resized copies of uploaded images used in srcset
+IMAGE_RENDITION_WIDTHS = (400, 800)
+
+# Threads generating the resized copies after upload, 0 to generate them during the request
+IMAGE_WORKERS = 2
+
+
+# SAML
+
+# SAML config file folders
+SAML_FOLDER = os.path.join(BASE_DIR, 'ecsswebauth', 'saml_config')
+
+SAML_GROUP_PREFIX = 'saml_'
+
+
+# FB
+
+FB_PAGE_ID = ''
+
+FB_ACCESS_TOKEN = ''
+
+# Seconds to wait for each Graph API request, failed requests are retried 3 times
+FB_GRAPH_API_TIMEOUT = 10
+
+# Seconds the upcoming events are cached for, syncing invalidates the cache earlier
+FB_EVENTS_CACHE_TIMEOUT = 3600
+
+# Download event covers into MEDIA_ROOT and serve resized copies instead of hot-linking Facebook
+FB_EVENTS_MIRROR_COVERS = True
+
+FB_EVENTS_MIRROR_WORKERS = 4
+
+
+# Face Detection
+
+FACE_DETECT_ENABLED = False
+
+FACE_DETECT_API = ''
+
+# Feedback
+
+# Key used to hash the IP addresses of feedback submissions, SECRET_KEY is used if empty
+FEEDBACK_IP_HASH_KEY = ''
+
+# PBKDF2 iterations of the IP address hash
+FEEDBACK_IP_HASH_ITERATIONS = 1
+
+# Also match IP addresses recorded with the old 100 rounds SHA-512 hash, which costs 100 hashes per request,
+# only set to True for the first 24 hours after upgrading, older records no longer count towards the limit
+FEEDBACK_IP_HASH_LEGACY = False
+
+# Where submissions are counted for the daily limit, 'database' or 'cache'
+# Expired database records are cleared by `python manage.py clearsubmittedips`
+FEEDBACK_RATE_LIMIT_BACKEND = 'database'
+
+
+# Auditlog
+
+# Entries older than this are moved to AUDITLOG_ARCHIVE_DIR by `python manage.py archiveauditlog`
+AUDITLOG_RETENTION_DAYS = 365
+
+AUDITLOG_ARCHIVE_DIR = os.path.join(BASE_DIR, 'auditlog-archive')
+
+
+# Shop
+
+SHOP_STRIPE_API_KEY = ''
+SHOP_STRIPE_ENDPOINT_KEY = ''
+# local test-only
+DATABASES['default']['TEST'] = {'MIGRATE': False}
+SILENCED_SYSTEM_CHECKS = ['models.W042', 'fields.W340']
@@ -33,6 +33,7 @@ urlpatterns = [
     path('portal/auditlog/', include('auditlog.urls')),
     path('portal/jumpstart/', include('jumpstart.urls')),
     path('portal/elections/', include('election.urls')),
+    path('portal/performance/', include('performance.urls')),
     # Admin
     path('admin/', include('ecsswebadmin.urls')),
     path('admin/', admin.site.urls),
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.shortcuts import resolve_url
+from django.test import Client
+from django.test.utils import override_settings
+
+import time
+
+SESSION_PROFILES = [
+    ('db', 'django.contrib.sessions.backends.db', 'django.contrib.messages.storage.session.SessionStorage'),
+    ('cached_db', 'django.contrib.sessions.backends.cached_db', 'django.contrib.messages.storage.fallback.FallbackStorage'),
+    ('signed_cookies', 'django.contrib.sessions.backends.signed_cookies', 'django.contrib.messages.storage.cookie.CookieStorage'),
+]
+
+BENCHMARK_USERNAME = '__benchmarksessions__'
+
+class Command(BaseCommand):
+    """ python manage.py benchmarksessions """
+
+    help = 'Compare authenticated request latency across the supported session profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--url', type=str, default=resolve_url(settings.LOGIN_REDIRECT_URL))
+
+    def handle(self, *args, **options):
+        # Left behind if a previous run was killed
+        user, created = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+        try:
+            for name, session_engine, message_storage in SESSION_PROFILES:
+                # Requests only reading the session, and requests also writing it
+                for save_every_request in (False, True):
+                    with override_settings(SESSION_ENGINE=session_engine, MESSAGE_STORAGE=message_storage, SESSION_SAVE_EVERY_REQUEST=save_every_request):
+                        timings = self._benchmark(user, options['url'], options['requests'])
+                    timings.sort()
+                    self.stdout.write('{:<16} {:<6} mean {:7.2f}ms  median {:7.2f}ms  p95 {:7.2f}ms'.format(
+                        name,
+                        'write' if save_every_request else 'read',
+                        sum(timings) / len(timings),
+                        timings[len(timings) // 2],
+                        timings[int(len(timings) * 0.95)],
+                    ))
+        finally:
+            user.delete()
+
+    def _benchmark(self, user, url, no_of_requests):
+        """Time each request in milliseconds."""
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        client.force_login(user)
+        # Warm up
+        client.get(url)
+        timings = []
+        for i in range(no_of_requests):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        # Delete the session
+        client.logout()
+        return timings
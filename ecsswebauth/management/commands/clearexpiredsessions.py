@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from importlib import import_module
+
+class Command(BaseCommand):
+    """ python manage.py clearexpiredsessions """
+
+    help = 'Clear expired sessions in small batches so the session table is never locked for long'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'SESSION_CLEAR_BATCH_SIZE', 500))
+
+    def handle(self, *args, **options):
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        try:
+            session_model = session_store.get_model_class()
+        except AttributeError:
+            # Not a database backed session engine, e.g. signed cookies or cache
+            try:
+                session_store.clear_expired()
+            except NotImplementedError:
+                self.stderr.write('Session engine {} does not support clearing expired sessions.'.format(settings.SESSION_ENGINE))
+            return
+
+        no_of_sessions_cleared = clear_expired_sessions(session_model, options['batch_size'])
+        self.stdout.write('Cleared {} session(s).'.format(no_of_sessions_cleared))
+
+
+def clear_expired_sessions(session_model, batch_size):
+    """Delete expired sessions batch by batch, each batch in its own short transaction."""
+    now = timezone.now()
+    no_of_sessions_cleared = 0
+    while True:
+        with transaction.atomic():
+            session_keys = list(session_model.objects.filter(expire_date__lt=now).values_list('session_key', flat=True)[:batch_size])
+            if not session_keys:
+                break
+            session_model.objects.filter(session_key__in=session_keys).delete()
+        no_of_sessions_cleared += len(session_keys)
+    return no_of_sessions_cleared
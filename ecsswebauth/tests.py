@@ -3,7 +3,13 @@ from django.shortcuts import resolve_url
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User, Group
+from django.contrib.sessions.models import Session
 from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from datetime import timedelta
+from io import StringIO
 
 from ecsswebauth.models import EcsswebUserGroup, SamlUser
 from ecsswebauth.views import _clean_next_url, _get_user_info_from_attributes
@@ -113,3 +119,28 @@ class AttributesTestCase(TestCase):
             'surname': 'surname1',
         }
         self.assertEqual(_get_user_info_from_attributes(attributes), userinfo)
+
+
+class ClearExpiredSessionsTestCase(TestCase):
+
+    def test_clearexpiredsessions(self):
+        for i in range(5):
+            Session.objects.create(session_key='expired{}'.format(i), session_data='', expire_date=timezone.now() - timedelta(days=1))
+        Session.objects.create(session_key='active', session_data='', expire_date=timezone.now() + timedelta(days=1))
+
+        out = StringIO()
+        with self.settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            call_command('clearexpiredsessions', batch_size=2, stdout=out)
+        self.assertEqual(out.getvalue().strip(), 'Cleared 5 session(s).')
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['active'])
+
+
+class BenchmarkSessionsTestCase(TestCase):
+
+    def test_leftover_user(self):
+        # Left behind by a killed run
+        User.objects.create(username='__benchmarksessions__')
+        stdout = StringIO()
+        call_command('benchmarksessions', requests=2, stdout=stdout)
+        self.assertIn('signed_cookies', stdout.getvalue())
+        self.assertFalse(User.objects.filter(username='__benchmarksessions__').exists())
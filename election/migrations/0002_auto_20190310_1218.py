@@ -1,7 +1,6 @@
 # Generated by Django 2.1.2 on 2019-03-10 12:18
 
 from django.db import migrations, models
-from ..models import Nomination
 import uuid
 
 
@@ -12,6 +11,8 @@ class Migration(migrations.Migration):
     ]
 
     def fill_nomination_uuid(apps, schema_editor):
+        # Historical model, the current one has fields added by later migrations
+        Nomination = apps.get_model('election', 'Nomination')
         for nomination in Nomination.objects.all():
             nomination.uuid = uuid.uuid4()
             nomination.save()
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.5 on 2026-10-19 18:00
+
+from django.db import migrations
+import website.fields
+
+
+def render_manifestos(apps, schema_editor):
+    from website.rendering import render_markdown
+    Nomination = apps.get_model('election', 'Nomination')
+    nominations = list(Nomination.objects.only('id', 'manifesto'))
+    for nomination in nominations:
+        nomination.manifesto_html = render_markdown(nomination.manifesto, linkify=False) if nomination.manifesto else ''
+    Nomination.objects.bulk_update(nominations, ['manifesto_html'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election', '0003_auto_20190319_2337'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nomination',
+            name='manifesto_html',
+            field=website.fields.RenderedMarkdownField(linkify=False, source_field='manifesto'),
+        ),
+        migrations.RunPython(render_manifestos, migrations.RunPython.noop),
+    ]
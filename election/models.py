@@ -4,6 +4,8 @@ from django.utils import timezone
 import uuid
 import os
 
+from website.fields import RenderedMarkdownField
+
 
 def nomination_image_file_name(instance, filename):
         return ('election/{}/{}-{}{}'.format(instance.position.election.codename, instance.uuid, uuid.uuid4(), os.path.splitext(filename)[1].lower()))
@@ -105,6 +107,7 @@ class Nomination(models.Model):
     nickname = models.CharField(max_length=50, null=True, blank=True)
     position = models.ForeignKey(Position, on_delete=models.PROTECT, verbose_name='nomination position')
     manifesto = models.TextField(verbose_name='nomination manifesto')
+    manifesto_html = RenderedMarkdownField(source_field='manifesto', linkify=False)
     photo = models.ImageField(upload_to=nomination_image_file_name)
     time = models.DateTimeField(auto_now=True)
 
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Election, Position, Nomination, Support, Voter, Vote, VoteRecord
+
+from website.caching import bump_version
+
+
+@receiver(post_save, sender=Election)
+@receiver(post_delete, sender=Election)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=Nomination)
+@receiver(post_delete, sender=Nomination)
+@receiver(post_save, sender=Support)
+@receiver(post_delete, sender=Support)
+@receiver(post_save, sender=Voter)
+@receiver(post_delete, sender=Voter)
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+@receiver(post_save, sender=VoteRecord)
+@receiver(post_delete, sender=VoteRecord)
+def invalidate_election(sender, **kwargs):
+    bump_version('election')
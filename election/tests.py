@@ -1,3 +1,47 @@
 from django.test import TestCase
+from django.contrib.auth.models import User, Group, Permission
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+
+from performance.testing import QueryBudgetMixin
+from website.caching import get_version, get_user_auth_version
+
+from .models import Election, Position, Nomination
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+
+    # Counted with the three positions of setUp, the election page still runs queries for each position
+    query_budgets = {
+        'election:elections': 9,
+        'election:election': 22,
+        'election:position': 13,
+    }
+
+    def setUp(self):
+        # Versions are created when first read
+        for scope in ('election', 'jumpstart', 'auth'):
+            get_version(scope)
+        election = Election.objects.create(codename='agm', name='AGM', has_nomination=False,
+                                           voting_start=timezone.now() - timedelta(days=1), voting_end=timezone.now() + timedelta(days=1))
+        for i in range(3):
+            position = Position.objects.create(codename='position{:02}'.format(i), name='Position {:02}'.format(i), election=election, description='', sort_order=i)
+            for j in range(2):
+                Nomination.objects.create(username='nominee{}{}'.format(i, j), name='Nominee {}{}'.format(i, j), position=position, manifesto='**Manifesto**', photo='election/agm/nominee{}{}.jpg'.format(i, j))
+        # ECS users can vote without checking the voters files
+        ecs_user = Permission.objects.get(codename='is_ecs_user')
+        self.user = User.objects.create_user('test')
+        self.user.user_permissions.add(ecs_user)
+        self.committee_user = User.objects.create_user('committee')
+        self.committee_user.user_permissions.add(ecs_user)
+        self.committee_user.groups.add(Group.objects.create(name='committee'))
+        for user in (self.user, self.committee_user):
+            get_user_auth_version(user.pk)
+
+    def test_query_budgets(self):
+        for user in (self.user, self.committee_user):
+            self.client.force_login(user)
+            self.assertContains(self.client.get('/portal/elections/'), 'AGM')
+            self.assertContains(self.client.get('/portal/elections/agm/'), 'Position 00')
+            self.assertContains(self.client.get('/portal/elections/agm/position00/'), 'Nominee 00')
@@ -14,15 +14,31 @@ from django.core.mail import EmailMessage
 from django.conf import settings
 import uuid
 import random
-import yaml
 import os
 
 from .models import Election, Position, Nomination, Support, Voter, Vote, VoteRecord
 from .forms import NominationForm
 from .utils import is_nomination_current, is_voting_current
 
+from website.datafiles import load_data_file
+from website.conditional import versions_condition
+
+
+CAN_NOMINATE_FILE = os.path.join(settings.BASE_DIR, 'election/data/ecss_can_nominate.txt')
+
+CAN_VOTE_FILE = os.path.join(settings.BASE_DIR, 'election/data/ecss_can_vote.txt')
+
+
+def _get_election_times():
+    # Pages change when nomination and voting open and close
+    times = []
+    for election in Election.objects.only('nomination_start', 'nomination_end', 'voting_start', 'voting_end'):
+        times.extend((election.nomination_start, election.nomination_end, election.voting_start, election.voting_end))
+    return times
+
 
 @login_required
+@versions_condition('election', 'jumpstart', transitions=_get_election_times)
 def elections(request):
     # show all current and future elections for committee
     if request.user.groups.filter(name='committee').exists():
@@ -42,7 +58,7 @@ def can_nominate(request):
     
     username = request.user.username
 
-    with open(os.path.join(settings.BASE_DIR, 'election/data/ecss_can_nominate.txt'), 'r') as file:
+    with open(CAN_NOMINATE_FILE, 'r') as file:
         for line in file:
             if username in line:
                 return True
@@ -58,7 +74,7 @@ def can_vote(request):
 
     username = request.user.username
 
-    with open(os.path.join(settings.BASE_DIR, 'election/data/ecss_can_vote.txt'), 'r') as file:
+    with open(CAN_VOTE_FILE, 'r') as file:
         for line in file:
             if username in line:
                 return True
@@ -66,6 +82,7 @@ def can_vote(request):
     return False
 
 @login_required
+@versions_condition('election', 'jumpstart', transitions=_get_election_times, files=(CAN_NOMINATE_FILE, CAN_VOTE_FILE))
 def election(request, election):
     election = get_object_or_404(Election, codename=election)
     # do not show past election
@@ -244,6 +261,7 @@ def support_shareable(request, election):
 
 class PositionView(LoginRequiredMixin, View):
 
+    @method_decorator(versions_condition('election', 'jumpstart', transitions=_get_election_times, files=(CAN_NOMINATE_FILE, CAN_VOTE_FILE)))
     def get(self, request, election, position):
         election = get_object_or_404(Election, codename=election)
         position = get_object_or_404(Position, election=election, codename=position)
@@ -324,9 +342,8 @@ class VoteView(PermissionRequiredMixin, View):
 @login_required
 def results(request):
     try:
-        with open(os.path.join(settings.BASE_DIR, 'election/data/agm2019.yaml')) as data_file:
-            election = yaml.load(data_file)
-    except:
+        election = load_data_file('election/data/agm2019.yaml')
+    except OSError:
         raise Http404()
     context = {
         'election': election,
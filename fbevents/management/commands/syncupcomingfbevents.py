@@ -1,11 +1,16 @@
 from django.core.management.base import BaseCommand
 
-from fbevents.utils import sync_upcoming_events_with_fb
+from fbevents.utils import sync_upcoming_events_with_fb, FixtureGraphClient
 
 class Command(BaseCommand):
     """ python manage.py syncupcomingfbevents """
 
     help = 'Sync upcoming events information with Facebook page events'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--fixture', type=str, help='Replay recorded Graph API responses from a JSON file instead of calling Facebook')
+
     def handle(self, *args, **options):
-        sync_upcoming_events_with_fb()
+        client = FixtureGraphClient(options['fixture']) if options['fixture'] else None
+        no_of_events_created, no_of_events_updated = sync_upcoming_events_with_fb(client)
+        self.stdout.write('Created {} and updated {} event(s).'.format(no_of_events_created, no_of_events_updated))
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.5 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fbevents', '0003_auto_20180919_0003'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_time', 'end_time'], name='fbevents_ev_start_t_7b61ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end_time', 'start_time'], name='fbevents_ev_end_tim_ae1c0b_idx'),
+        ),
+    ]
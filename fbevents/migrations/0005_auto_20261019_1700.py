@@ -0,0 +1,23 @@
+# Generated by Django 2.2.5 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fbevents', '0004_auto_20261019_1600'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='cover_image',
+            field=models.ImageField(blank=True, upload_to='events/covers/'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='cover_mirrored_from',
+            field=models.URLField(blank=True),
+        ),
+    ]
@@ -1,4 +1,13 @@
 from django.db import models
+from django.core.files.storage import default_storage
+
+import os
+
+
+# Widths of the resized covers, the cards on the homepage are 25rem wide
+COVER_WIDTHS = (400, 800)
+
+COVER_FORMATS = ('jpg', 'webp')
 
 
 class Event(models.Model):
@@ -6,8 +15,37 @@ class Event(models.Model):
     name = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
     cover = models.URLField()
+    # Local copy of the cover, resized to COVER_WIDTHS next to it
+    cover_image = models.ImageField(upload_to='events/covers/', blank=True)
+    # The Facebook URL cover_image was downloaded from
+    cover_mirrored_from = models.URLField(blank=True)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_time', 'end_time']),
+            models.Index(fields=['end_time', 'start_time']),
+        ]
+
     def __str__(self):
         return 'name: {},fb_id: {}'.format(self.name, self.fb_id)
+
+    def get_cover_rendition_name(self, width, image_format):
+        return '{}-{}.{}'.format(os.path.splitext(self.cover_image.name)[0], width, image_format)
+
+    def get_cover_url(self):
+        if self.cover_image:
+            return default_storage.url(self.get_cover_rendition_name(COVER_WIDTHS[0], 'jpg'))
+        return self.cover
+
+    def _get_cover_srcset(self, image_format):
+        if not self.cover_image:
+            return ''
+        return ', '.join('{} {}w'.format(default_storage.url(self.get_cover_rendition_name(width, image_format)), width) for width in COVER_WIDTHS)
+
+    def get_cover_srcset(self):
+        return self._get_cover_srcset('jpg')
+
+    def get_cover_webp_srcset(self):
+        return self._get_cover_srcset('webp')
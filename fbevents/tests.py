@@ -1,3 +1,119 @@
 from django.test import TestCase
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+from PIL import Image
+import io
+import os
+import shutil
+import tempfile
+
+from .models import Event
+from .utils import sync_upcoming_events_with_fb, FixtureGraphClient, get_cached_upcoming_events
+from .models import COVER_WIDTHS
+
+from website.models import Version
+
+FIXTURE_FILE_NAME = os.path.join(os.path.dirname(__file__), 'testdata', 'graph-events.json')
+
+class SyncUpcomingEventsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sync(self):
+        # Test following pages and skipping past events
+        self.assertEqual(sync_upcoming_events_with_fb(FixtureGraphClient(FIXTURE_FILE_NAME)), (3, 0))
+        self.assertEqual(set(Event.objects.values_list('name', flat=True)), {'Games Night', 'Welcome Talk', 'Hackathon'})
+        games_night = Event.objects.get(fb_id='1000000000000003')
+        self.assertEqual(games_night.location, 'Building 32')
+        self.assertEqual(games_night.cover, 'https://scontent.example.com/games-night.jpg')
+        self.assertIsNone(Event.objects.get(fb_id='1000000000000002').end_time)
+
+        # Test unchanged events are not updated, only the sync version is bumped
+        with self.assertNumQueries(2):
+            self.assertEqual(sync_upcoming_events_with_fb(FixtureGraphClient(FIXTURE_FILE_NAME)), (0, 0))
+
+        # Test changed events are updated
+        Event.objects.filter(fb_id='1000000000000001').update(name='Old name')
+        self.assertEqual(sync_upcoming_events_with_fb(FixtureGraphClient(FIXTURE_FILE_NAME)), (0, 1))
+        self.assertEqual(Event.objects.get(fb_id='1000000000000001').name, 'Hackathon')
+
+
+class CachedUpcomingEventsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_get_cached_upcoming_events(self):
+        now = timezone.now()
+        Event.objects.create(fb_id='1', name='Event 01', location='', cover='', start_time=now - timedelta(hours=1), end_time=now + timedelta(seconds=1))
+        Event.objects.create(fb_id='2', name='Event 02', location='', cover='', start_time=now + timedelta(days=1))
+        self.assertEqual([event.name for event in get_cached_upcoming_events()], ['Event 01', 'Event 02'])
+
+        # Test served from cache, only the sync version is read
+        with self.assertNumQueries(1):
+            get_cached_upcoming_events()
+
+        # Test changes are not seen until the next sync
+        Event.objects.filter(fb_id='1').update(end_time=now - timedelta(seconds=1))
+        self.assertEqual(len(get_cached_upcoming_events()), 2)
+
+        # Test sync invalidates the cache
+        sync_upcoming_events_with_fb(FixtureGraphClient(FIXTURE_FILE_NAME))
+        self.assertEqual([event.name for event in get_cached_upcoming_events()], ['Event 02', 'Hackathon', 'Welcome Talk', 'Games Night'])
+
+        # Test syncs of other processes, e.g. cron, invalidate the cache
+        Event.objects.filter(fb_id='2').delete()
+        Version.objects.filter(scope='fbevents').update(version=F('version') + 1)
+        self.assertEqual([event.name for event in get_cached_upcoming_events()], ['Hackathon', 'Welcome Talk', 'Games Night'])
+
+
+class ImageFixtureGraphClient(FixtureGraphClient):
+
+    def __init__(self, fixture_file_name):
+        super().__init__(fixture_file_name)
+        self.downloaded_urls = []
+
+    def download(self, url):
+        self.downloaded_urls.append(url)
+        image_io = io.BytesIO()
+        Image.new('RGB', (1200, 600), 'red').save(image_io, 'PNG')
+        return image_io.getvalue()
+
+
+class MirrorEventCoversTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root)
+
+    def test_mirror_event_covers(self):
+        with self.settings(MEDIA_ROOT=self.media_root, MEDIA_URL='/media/'):
+            client = ImageFixtureGraphClient(FIXTURE_FILE_NAME)
+            sync_upcoming_events_with_fb(client)
+            self.assertEqual(len(client.downloaded_urls), 3)
+
+            event = Event.objects.get(fb_id='1000000000000003')
+            self.assertEqual(event.cover_mirrored_from, event.cover)
+            self.assertEqual(event.get_cover_url(), '/media/events/covers/1000000000000003-400.jpg')
+            self.assertEqual(event.get_cover_webp_srcset(), '/media/events/covers/1000000000000003-400.webp 400w, /media/events/covers/1000000000000003-800.webp 800w')
+            for width in COVER_WIDTHS:
+                with Image.open(os.path.join(self.media_root, 'events', 'covers', '1000000000000003-{}.webp'.format(width))) as rendition:
+                    self.assertEqual(rendition.size, (width, width // 2))
+
+            # Test unchanged covers are not downloaded again
+            client = ImageFixtureGraphClient(FIXTURE_FILE_NAME)
+            sync_upcoming_events_with_fb(client)
+            self.assertEqual(client.downloaded_urls, [])
+
+    def test_cover_fallback(self):
+        sync_upcoming_events_with_fb(FixtureGraphClient(FIXTURE_FILE_NAME))
+        event = Event.objects.get(fb_id='1000000000000003')
+        self.assertEqual(event.get_cover_url(), 'https://scontent.example.com/games-night.jpg')
+        self.assertEqual(event.get_cover_srcset(), '')
@@ -1,38 +1,226 @@
-import urllib.request, json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import io
+import json
+import logging
 
 from django.utils import timezone
+from django.core.cache import cache
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from PIL import Image
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fbevents.models import Event, COVER_WIDTHS
+from website.caching import get_version, bump_version
+
+
+logger = logging.getLogger(__name__)
+
+
+FB_EVENTS_FIELDS = 'name,id,place,cover,start_time,end_time'
+
+SYNC_FIELDS = ['name', 'location', 'cover', 'start_time', 'end_time']
+
+UPCOMING_EVENTS_CACHE_KEY = 'fbevents:upcoming-events:{}'
+
+
+class GraphClient:
+    """Facebook Graph API client reusing one keep-alive connection, with timeouts and retries."""
+
+    def __init__(self, access_token=None, timeout=None, retries=3):
+        self.access_token = access_token if access_token is not None else settings.FB_ACCESS_TOKEN
+        self.timeout = timeout if timeout is not None else getattr(settings, 'FB_GRAPH_API_TIMEOUT', 10)
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(max_retries=retry))
+
+    def get_events_pages(self, page_id):
+        """Yield the data of each page of the events of a Facebook page, following the paging cursors."""
+        url = 'https://graph.facebook.com/{}/events'.format(page_id)
+        params = {
+            'access_token': self.access_token,
+            'fields': FB_EVENTS_FIELDS,
+        }
+        while url:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            events = response.json()
+            yield events.get('data', [])
+            # The next URL already contains all the parameters
+            url = events.get('paging', {}).get('next')
+            params = None
+
+    def download(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+class FixtureGraphClient:
+    """Stand-in for GraphClient replaying recorded Graph API responses, a JSON list of response bodies."""
+
+    def __init__(self, fixture_file_name):
+        with open(fixture_file_name) as fixture_file:
+            self.responses = json.load(fixture_file)
+
+    def get_events_pages(self, page_id):
+        for events in self.responses:
+            yield events.get('data', [])
+            if not events.get('paging', {}).get('next'):
+                break
+
+    def download(self, url):
+        # Recorded responses have no images, covers are left on Facebook
+        return None
+
+
+def _parse_time(time):
+    return datetime.strptime(time, '%Y-%m-%dT%H:%M:%S%z') if time else None
+
+
+def _get_event_fields(event):
+    location = ''
+    if 'place' in event and 'name' in event['place']:
+        location = event['place']['name']
+    return {
+        'name': event['name'],
+        'location': location,
+        'cover': event.get('cover', {}).get('source', ''),
+        'start_time': _parse_time(event['start_time']),
+        'end_time': _parse_time(event.get('end_time')),
+    }
+
+
+def _is_upcoming(fields, now):
+    return (fields['end_time'] and now < fields['end_time']) or now < fields['start_time']
+
+
+def sync_upcoming_events_with_fb(client=None):
+    """Create and update the upcoming events from Facebook, returns the numbers of events created and updated.
+
+       Facebook lists the newest events first, so paging stops at the first page without upcoming events.
+    """
+    if client is None:
+        client = GraphClient()
+    now = timezone.now()
+
+    upcoming_events = {}
+    for events in client.get_events_pages(settings.FB_PAGE_ID):
+        page_upcoming_events = {}
+        for event in events:
+            fields = _get_event_fields(event)
+            if _is_upcoming(fields, now):
+                page_upcoming_events[event['id']] = fields
+        if not page_upcoming_events:
+            break
+        upcoming_events.update(page_upcoming_events)
+
+    # Diff against the stored events in one query
+    existing_events = Event.objects.in_bulk(list(upcoming_events), field_name='fb_id')
+    events_to_create = []
+    events_to_update = []
+    for fb_id, fields in upcoming_events.items():
+        event = existing_events.get(fb_id)
+        if event is None:
+            events_to_create.append(Event(fb_id=fb_id, **fields))
+        elif any(getattr(event, field) != value for field, value in fields.items()):
+            for field, value in fields.items():
+                setattr(event, field, value)
+            events_to_update.append(event)
+
+    if events_to_create or events_to_update:
+        with transaction.atomic():
+            Event.objects.bulk_create(events_to_create)
+            Event.objects.bulk_update(events_to_update, SYNC_FIELDS)
+    if getattr(settings, 'FB_EVENTS_MIRROR_COVERS', True):
+        events_to_mirror = [event for event in existing_events.values() if event.cover and event.cover != event.cover_mirrored_from]
+        # Created events have no primary key from bulk_create on every database, so they are fetched again
+        if any(event.cover for event in events_to_create):
+            events_to_mirror += Event.objects.filter(fb_id__in=[event.fb_id for event in events_to_create if event.cover])
+        mirror_event_covers(events_to_mirror, client.download)
+    bump_sync_version()
+    return len(events_to_create), len(events_to_update)
+
+
+def _replace_file(name, data):
+    default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
+def _encode_image(image, pil_format, **options):
+    image_io = io.BytesIO()
+    image.save(image_io, pil_format, **options)
+    return image_io.getvalue()
+
+
+def _save_cover_renditions(event, image_data):
+    """Save the cover and its resized JPEG and WebP renditions."""
+    image = Image.open(io.BytesIO(image_data)).convert('RGB')
+    event.cover_image.name = _replace_file('events/covers/{}.jpg'.format(event.fb_id), _encode_image(image, 'JPEG', quality=90))
+    for width in COVER_WIDTHS:
+        rendition = image
+        if image.width > width:
+            rendition = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        _replace_file(event.get_cover_rendition_name(width, 'jpg'), _encode_image(rendition, 'JPEG', quality=85, optimize=True, progressive=True))
+        _replace_file(event.get_cover_rendition_name(width, 'webp'), _encode_image(rendition, 'WEBP', quality=80))
+
+
+def _mirror_event_cover(event, download):
+    try:
+        image_data = download(event.cover)
+        if image_data is None:
+            return False
+        _save_cover_renditions(event, image_data)
+    except Exception:
+        logger.exception('Failed to mirror the cover of event %s', event.fb_id)
+        return False
+    event.cover_mirrored_from = event.cover
+    return True
+
+
+def mirror_event_covers(events, download, max_workers=None):
+    """Download and resize the covers of events concurrently, returns the number of covers mirrored."""
+    events = list(events)
+    if max_workers is None:
+        max_workers = getattr(settings, 'FB_EVENTS_MIRROR_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda event: _mirror_event_cover(event, download), events))
+    mirrored_events = [event for event, mirrored in zip(events, results) if mirrored]
+    Event.objects.bulk_update(mirrored_events, ['cover_image', 'cover_mirrored_from'])
+    return len(mirrored_events)
+
+
+def get_sync_version():
+    # Kept in the database, so syncs run by cron reach the web processes
+    return get_version('fbevents')
+
+
+def bump_sync_version():
+    """Invalidate the cached upcoming events."""
+    bump_version('fbevents')
 
-from fbevents.models import Event
-
-
-# Assume all the upcoming events are in the first page, paging is ignored
-def sync_upcoming_events_with_fb():
-    fb_events_api = 'https://graph.facebook.com/{}/events?access_token={}&fields=name,id,place,cover,start_time,end_time'.format(settings.FB_PAGE_ID, settings.FB_ACCESS_TOKEN)
-    with urllib.request.urlopen(fb_events_api) as url:
-        events = json.loads(url.read().decode())
-        for event in events['data']:
-            end_time = event.get('end_time', None)
-            if end_time:
-                end_time = datetime.strptime(end_time, '%Y-%m-%dT%H:%M:%S%z')
-            start_time = datetime.strptime(event['start_time'], '%Y-%m-%dT%H:%M:%S%z')
-            now = timezone.now()
-
-            location = ''
-            if 'place' in event and 'name' in event['place']:
-                location = event['place']['name']
-
-            if (end_time and now < end_time) or now < start_time:
-                defaults = {
-                    'name': event['name'],
-                    'location': location,
-                    'cover': event['cover']['source'],
-                    'start_time': event['start_time'],
-                    'end_time': end_time,
-                }
-                Event.objects.update_or_create(fb_id=event['id'], defaults=defaults)
 
 def get_upcoming_events():
     return Event.objects.filter(Q(end_time__gt=timezone.now()) | Q(start_time__gt=timezone.now())).order_by('start_time')
+
+
+def get_cached_upcoming_events():
+    """Upcoming events cached until the next sync.
+
+       Events only drop out of the list between syncs, so the cached list is filtered again by the current time.
+    """
+    cache_key = UPCOMING_EVENTS_CACHE_KEY.format(get_sync_version())
+    events = cache.get(cache_key)
+    if events is None:
+        events = list(get_upcoming_events())
+        cache.set(cache_key, events, getattr(settings, 'FB_EVENTS_CACHE_TIMEOUT', 3600))
+    now = timezone.now()
+    return [event for event in events if (event.end_time and event.end_time > now) or event.start_time > now]
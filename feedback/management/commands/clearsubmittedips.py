@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from feedback.views import get_submit_rate_limiter
+
+class Command(BaseCommand):
+    """ python manage.py clearsubmittedips """
+
+    help = 'Clear submitted IP address records older than the feedback submission limit window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        no_of_records_cleared = get_submit_rate_limiter().clear_expired(options['batch_size'])
+        self.stdout.write('Cleared {} submitted IP record(s).'.format(no_of_records_cleared))
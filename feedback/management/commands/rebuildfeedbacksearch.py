@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feedback import search
+
+class Command(BaseCommand):
+    """ python manage.py rebuildfeedbacksearch """
+
+    help = 'Rebuild the full-text search index of feedback and responses'
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        backend.install()
+        no_of_feedback = backend.rebuild()
+        self.stdout.write('Indexed {} feedback with {}.'.format(no_of_feedback, type(backend).__name__))
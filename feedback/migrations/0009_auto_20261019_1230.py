@@ -0,0 +1,21 @@
+# Generated by Django 2.2.5 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0008_feedback_uuid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submittediprecord',
+            index=models.Index(fields=['ip_hash', 'time'], name='feedback_su_ip_hash_5cb7a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submittediprecord',
+            index=models.Index(fields=['time'], name='feedback_su_time_2c8569_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.5 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0009_auto_20261019_1230'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['time', 'id'], name='feedback_fe_time_9ffce1_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, transaction, OperationalError
+
+
+def install_search_index(apps, schema_editor):
+    # Same tables and indexes as feedback.search, written out so the migration does not change with it
+    Feedback = apps.get_model('feedback', 'Feedback')
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("CREATE INDEX IF NOT EXISTS feedback_feedback_message_search ON feedback_feedback USING GIN (to_tsvector('english', message))")
+            cursor.execute("CREATE INDEX IF NOT EXISTS feedback_response_message_search ON feedback_response USING GIN (to_tsvector('english', message))")
+        elif connection.vendor == 'sqlite':
+            try:
+                with transaction.atomic(using=connection.alias):
+                    cursor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS feedback_search USING fts5(message, response)')
+            except OperationalError:
+                # SQLite without FTS5, feedback is searched without an index
+                return
+            cursor.execute('DELETE FROM feedback_search')
+            rows = Feedback.objects.using(connection.alias).order_by('id').values_list('id', 'message', 'response__message')
+            cursor.executemany('INSERT INTO feedback_search(rowid, message, response) VALUES (%s, %s, %s)', [[row[0], row[1], row[2] or ''] for row in rows])
+
+
+def uninstall_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS feedback_feedback_message_search')
+            cursor.execute('DROP INDEX IF EXISTS feedback_response_message_search')
+        elif connection.vendor == 'sqlite':
+            cursor.execute('DROP TABLE IF EXISTS feedback_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0010_auto_20261019_1300'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -24,6 +24,11 @@ class Feedback(models.Model):
     # Record if a committee member submitted the feedback
     committee = models.CharField(max_length=150, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['time', 'id']),
+        ]
+
     def __str__(self):
         return self.message
 
@@ -40,6 +45,12 @@ class SubmittedIpRecord(models.Model):
     ip_hash = models.CharField(max_length=128)
     time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['ip_hash', 'time']),
+            models.Index(fields=['time']),
+        ]
+
 class FeedbackAuditLog(models.Model):
     ACTIONS = (
         ('create', 'created'),
@@ -52,5 +63,11 @@ class FeedbackAuditLog(models.Model):
     feedback = models.ForeignKey(Feedback, on_delete=models.SET_NULL, null=True)
     auditlog = GenericRelation(AuditLog)
 
+    def auditlog_summary(self):
+        return '{} {} a feedback response'.format(self.user, self.get_action_display())
+
+    def auditlog_str(self, time):
+        return '{} at {}'.format(self.auditlog_summary(), time)
+
     def __str__(self):
-        return '{} {} a feedback response at {}'.format(self.user, self.get_action_display(), self.auditlog.get().time)
+        return self.auditlog_str(self.auditlog.get().time)
@@ -0,0 +1,156 @@
+from django.db import connection, transaction, DatabaseError, OperationalError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from website.pagination import keyset_paginate
+
+from .models import Feedback
+
+SQLITE_TABLE = 'feedback_search'
+POSTGRES_CONFIG = 'english'
+
+
+class PythonSearchBackend:
+    """Fallback when the database has no full-text search, a substring match without index."""
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def update(self, feedback_id):
+        pass
+
+    def remove(self, feedback_id):
+        pass
+
+    def rebuild(self):
+        return 0
+
+    def search(self, queryset, query):
+        for term in query.split():
+            queryset = queryset.filter(Q(message__icontains=term) | Q(response__message__icontains=term))
+        return queryset
+
+
+class SqliteSearchBackend:
+    """SQLite FTS5 table of feedback and response messages with the feedback id as rowid."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5(message, response)'.format(SQLITE_TABLE))
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS {}'.format(SQLITE_TABLE))
+
+    def update(self, feedback_id):
+        row = Feedback.objects.filter(pk=feedback_id).values_list('id', 'message', 'response__message').first()
+        with self.connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {} WHERE rowid = %s'.format(SQLITE_TABLE), [feedback_id])
+            if row:
+                cursor.execute('INSERT INTO {}(rowid, message, response) VALUES (%s, %s, %s)'.format(SQLITE_TABLE), [row[0], row[1], row[2] or ''])
+
+    def remove(self, feedback_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {} WHERE rowid = %s'.format(SQLITE_TABLE), [feedback_id])
+
+    def rebuild(self, batch_size=1000):
+        rows = Feedback.objects.order_by('id').values_list('id', 'message', 'response__message')
+        no_of_feedback = 0
+        with self.connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(SQLITE_TABLE))
+            batch = []
+            for row in rows.iterator():
+                batch.append([row[0], row[1], row[2] or ''])
+                if len(batch) >= batch_size:
+                    cursor.executemany('INSERT INTO {}(rowid, message, response) VALUES (%s, %s, %s)'.format(SQLITE_TABLE), batch)
+                    no_of_feedback += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany('INSERT INTO {}(rowid, message, response) VALUES (%s, %s, %s)'.format(SQLITE_TABLE), batch)
+                no_of_feedback += len(batch)
+        return no_of_feedback
+
+    def search(self, queryset, query):
+        # Quote every term so user input is never parsed as FTS5 query syntax
+        match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+        if not match:
+            return queryset.none()
+        # Matched within the same query as the queryset's filters, so no visible match is left out
+        return queryset.filter(id__in=RawSQL('SELECT rowid FROM {0} WHERE {0} MATCH %s'.format(SQLITE_TABLE), [match]))
+
+
+class PostgresSearchBackend:
+    """GIN expression indexes on the tsvector of feedback and response messages, kept up to date by PostgreSQL."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("CREATE INDEX IF NOT EXISTS feedback_feedback_message_search ON feedback_feedback USING GIN (to_tsvector('{}', message))".format(POSTGRES_CONFIG))
+            cursor.execute("CREATE INDEX IF NOT EXISTS feedback_response_message_search ON feedback_response USING GIN (to_tsvector('{}', message))".format(POSTGRES_CONFIG))
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('DROP INDEX IF EXISTS feedback_feedback_message_search')
+            cursor.execute('DROP INDEX IF EXISTS feedback_response_message_search')
+
+    def update(self, feedback_id):
+        pass
+
+    def remove(self, feedback_id):
+        pass
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('REINDEX INDEX feedback_feedback_message_search')
+            cursor.execute('REINDEX INDEX feedback_response_message_search')
+        return Feedback.objects.count()
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(id__in=RawSQL("SELECT id FROM feedback_feedback WHERE to_tsvector('{0}', message) @@ plainto_tsquery('{0}', %s)".format(POSTGRES_CONFIG), [query])) |
+            Q(id__in=RawSQL("SELECT feedback_id FROM feedback_response WHERE to_tsvector('{0}', message) @@ plainto_tsquery('{0}', %s)".format(POSTGRES_CONFIG), [query]))
+        )
+
+
+# FTS5 availability of each database alias
+_sqlite_fts5_available = {}
+
+def _is_sqlite_fts5_available(connection):
+    if connection.alias not in _sqlite_fts5_available:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+                _sqlite_fts5_available[connection.alias] = bool(cursor.fetchone()[0])
+        except DatabaseError:
+            _sqlite_fts5_available[connection.alias] = False
+    return _sqlite_fts5_available[connection.alias]
+
+
+def get_backend(connection=connection):
+    if connection.vendor == 'sqlite' and _is_sqlite_fts5_available(connection):
+        return SqliteSearchBackend(connection)
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend(connection)
+    return PythonSearchBackend()
+
+
+def search(queryset, query, per_page=10, before=None, after=None):
+    """Page of the feedback of the queryset whose feedback or response messages match the query, newest first.
+
+       before and after are cursors as for website.pagination.keyset_paginate.
+    """
+    backend = get_backend()
+    try:
+        with transaction.atomic():
+            return keyset_paginate(backend.search(queryset, query), ('time', 'id'), per_page, before=before, after=after)
+    except OperationalError:
+        # Search index not installed, e.g. migrations not applied
+        return keyset_paginate(PythonSearchBackend().search(queryset, query), ('time', 'id'), per_page, before=before, after=after)
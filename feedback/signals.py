@@ -0,0 +1,35 @@
+from django.db import OperationalError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Feedback, Response
+from . import search
+
+
+def _update_search_index(feedback_id):
+    try:
+        search.get_backend().update(feedback_id)
+    except OperationalError:
+        # Search index not installed, it can be built later with `python manage.py rebuildfeedbacksearch`
+        pass
+
+
+@receiver(post_save, sender=Feedback)
+def update_feedback_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _update_search_index(instance.id)
+
+
+@receiver(post_save, sender=Response)
+@receiver(post_delete, sender=Response)
+def update_response_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _update_search_index(instance.feedback_id)
+
+
+@receiver(post_delete, sender=Feedback)
+def remove_feedback_search_index(sender, instance, **kwargs):
+    try:
+        search.get_backend().remove(instance.id)
+    except OperationalError:
+        pass
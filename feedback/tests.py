@@ -1,8 +1,13 @@
-from django.test import TestCase
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import User, Permission
+from django.urls import reverse
 
-from .models import Feedback, Category, Response
+from performance.testing import QueryBudgetMixin
 
-from .views import _get_page_range
+from .models import Feedback, Category, Response, SubmittedIpRecord
+
+from . import search
+from .views import _get_page_range, _get_ip_hash, _get_legacy_ip_hash, _is_not_exceed_submit_limit, _get_ip_hashes
 
 class FeedbackTestCase(TestCase):
 
@@ -87,3 +92,136 @@ class PaginatorTestCase(TestCase):
 
         # Test current page is the last one
         self.assertEqual(_get_page_range(10, 10, 3), range(4, 11))
+
+
+class IpHashTestCase(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_get_ip_hash(self):
+        request01 = self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+        request02 = self.factory.get('/', REMOTE_ADDR='10.0.0.2')
+
+        # Test same IP address gets the same hash
+        self.assertEqual(_get_ip_hash(request01), _get_ip_hash(self.factory.get('/', REMOTE_ADDR='10.0.0.1')))
+        self.assertNotEqual(_get_ip_hash(request01), _get_ip_hash(request02))
+        self.assertEqual(len(_get_ip_hash(request01)), 128)
+
+        # Test hash depends on the key
+        with self.settings(FEEDBACK_IP_HASH_KEY='another_key'):
+            self.assertNotEqual(_get_ip_hash(self.factory.get('/', REMOTE_ADDR='10.0.0.1')), _get_ip_hash(request01))
+
+        # Test memoized on the request
+        request01.META['REMOTE_ADDR'] = '10.0.0.2'
+        self.assertNotEqual(_get_ip_hash(request01), _get_ip_hash(request02))
+
+    def test_legacy_ip_hash_limit(self):
+        request = self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+        for i in range(3):
+            SubmittedIpRecord.objects.create(ip_hash=_get_legacy_ip_hash('10.0.0.1'))
+        for i in range(2):
+            SubmittedIpRecord.objects.create(ip_hash=_get_ip_hash(request))
+
+        # Test records hashed by the legacy scheme only count towards the limit when enabled
+        self.assertTrue(_is_not_exceed_submit_limit(_get_ip_hashes(request)))
+        with self.settings(FEEDBACK_IP_HASH_LEGACY=True):
+            self.assertFalse(_is_not_exceed_submit_limit(_get_ip_hashes(request)))
+
+
+class SearchTestCase(TestCase):
+
+    def setUp(self):
+        search.get_backend().install()
+        category_others = Category.objects.create(name='Others')
+        self.feedback01 = Feedback.objects.create(message='The printer in the lab is broken', category=category_others)
+        self.feedback02 = Feedback.objects.create(message='More socials please', category=category_others)
+        Response.objects.create(feedback=self.feedback02, message='We will organise a pub crawl')
+
+    def test_search(self):
+        feedbacks = Feedback.objects.all()
+        self.assertEqual(list(search.search(feedbacks, 'printer')), [self.feedback01])
+
+        # Test search responses
+        self.assertEqual(list(search.search(feedbacks, 'crawl')), [self.feedback02])
+
+        # Test index updated on save
+        self.feedback01.message = 'The coffee machine is broken'
+        self.feedback01.save()
+        self.assertEqual(list(search.search(feedbacks, 'printer')), [])
+        self.assertEqual(list(search.search(feedbacks, 'coffee')), [self.feedback01])
+        self.feedback02.response.delete()
+        self.assertEqual(list(search.search(feedbacks, 'crawl')), [])
+
+        # Test query syntax is not interpreted
+        self.assertEqual(list(search.search(feedbacks, 'coffee" OR "socials')), [])
+
+        # Test only searching within the queryset
+        self.assertEqual(list(search.search(feedbacks.filter(response__isnull=False), 'coffee')), [])
+
+    def test_search_pages(self):
+        category_others = Category.objects.get(name='Others')
+        for i in range(15):
+            feedback = Feedback.objects.create(message='Printer {}'.format(i), category=category_others)
+            if i % 2:
+                Response.objects.create(feedback=feedback, message='Fixed')
+
+        # Test all visible matches are found, however many other matches there are
+        page = search.search(Feedback.objects.filter(response__isnull=False), 'printer', per_page=5)
+        self.assertEqual(len(page), 5)
+        self.assertTrue(page.has_next())
+        page = search.search(Feedback.objects.filter(response__isnull=False), 'printer', per_page=5, before=page.next_cursor())
+        self.assertEqual(len(page), 2)
+        self.assertFalse(page.has_next())
+
+    def test_search_view(self):
+        user = User.objects.create_user('test')
+        self.client.force_login(user)
+        category_others = Category.objects.get(name='Others')
+        for i in range(12):
+            feedback = Feedback.objects.create(message='Socials {}'.format(i), category=category_others)
+            Response.objects.create(feedback=feedback, message='OK')
+        response = self.client.get(reverse('feedback:search'), {'q': 'socials'})
+        self.assertEqual(len(response.context['feedbacks']), 10)
+        # Test the next page keeps the query
+        self.assertContains(response, '?q=socials&amp;before=')
+
+    def test_rebuild(self):
+        backend = search.get_backend()
+        backend.uninstall()
+        backend.install()
+        self.assertEqual(list(search.search(Feedback.objects.all(), 'printer')), [])
+        backend.rebuild()
+        self.assertEqual(list(search.search(Feedback.objects.all(), 'printer')), [self.feedback01])
+
+    def test_python_search_backend(self):
+        self.assertEqual(list(search.PythonSearchBackend().search(Feedback.objects.all(), 'crawl')), [self.feedback02])
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+
+    # Counted with the feedback of setUp, a page of feedback must not run queries for each feedback
+    query_budgets = {
+        'feedback:view': 8,
+        'feedback:search': 10,
+        'feedback:respond': 10,
+    }
+
+    def setUp(self):
+        search.get_backend().install()
+        category_others = Category.objects.create(name='Others')
+        for i in range(12):
+            feedback = Feedback.objects.create(message='Socials {}'.format(i), category=category_others)
+            if i % 3:
+                Response.objects.create(feedback=feedback, message='OK')
+        self.user = User.objects.create_user('test')
+        self.committee_user = User.objects.create_user('committee')
+        self.committee_user.user_permissions.add(Permission.objects.get(codename='add_response'))
+
+    def test_query_budgets(self):
+        for user in (self.user, self.committee_user):
+            self.client.force_login(user)
+            self.assertContains(self.client.get(reverse('feedback:view')), 'Socials')
+            self.assertContains(self.client.get(reverse('feedback:search'), {'q': 'socials'}), 'Socials')
+        feedback = Feedback.objects.first()
+        self.assertContains(self.client.get(reverse('feedback:respond', args=[feedback.uuid])), feedback.message)
@@ -6,5 +6,6 @@ app_name='feedback'
 urlpatterns = [
     path('', views.submit, name='submit'),
     path('view/', views.view, name='view'),
+    path('search/', views.search, name='search'),
     path('<uuid:feedback_uuid>/respond/', views.respond, name='respond'),
 ]
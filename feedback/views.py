@@ -3,15 +3,18 @@ from django.contrib import messages
 from django.contrib.messages import get_messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.paginator import Paginator
-from django.utils import timezone
+from django.conf import settings
 
 from datetime import timedelta
 import hashlib
 
 from .models import Feedback, Response, SubmittedIpRecord, FeedbackAuditLog
-from auditlog.models import AuditLog
+from auditlog import audit
+from website.ratelimit import RateLimiter, DatabaseBackend, CacheBackend
+from website.pagination import keyset_paginate
 
 from .forms import SubmitForm, RespondForm
+from . import search as feedback_search
 
 def _get_page_range(page_num, num_pages, adjacents):
     if adjacents * 2 + 1 >= num_pages:
@@ -30,27 +33,48 @@ def _get_page_range(page_num, num_pages, adjacents):
 
     return range(begin, end + 1)
 
-def _get_ip_hash(request, times=100):
-    ip = request.META.get('REMOTE_ADDR') # Works only if not behind a reverse proxy
-    # Hash IP address 100 times
+def _get_legacy_ip_hash(ip, times=100):
+    # Hash IP address 100 times, used before keyed hashing was introduced
     ip_hash = hashlib.sha512(ip.encode('utf-8')).hexdigest()
     for i in range(0, times - 1):
         ip_hash = hashlib.sha512(ip_hash.encode('utf-8')).hexdigest()
     return ip_hash
 
+def _get_ip_hash(request):
+    # Memoize on the request, the hash is needed by both the limit check and the submission record
+    if not hasattr(request, '_feedback_ip_hash'):
+        ip = request.META.get('REMOTE_ADDR') # Works only if not behind a reverse proxy
+        key = getattr(settings, 'FEEDBACK_IP_HASH_KEY', '') or settings.SECRET_KEY
+        iterations = getattr(settings, 'FEEDBACK_IP_HASH_ITERATIONS', 1)
+        request._feedback_ip_hash = hashlib.pbkdf2_hmac('sha512', ip.encode('utf-8'), key.encode('utf-8'), iterations).hex()
+    return request._feedback_ip_hash
+
+def _get_ip_hashes(request):
+    """All the hashes an IP address could have been recorded with within the last 24 hours."""
+    ip_hashes = [_get_ip_hash(request)]
+    # Legacy hashes can only be in the window during the first 24 hours after upgrading
+    if getattr(settings, 'FEEDBACK_IP_HASH_LEGACY', False):
+        ip_hashes.append(_get_legacy_ip_hash(request.META.get('REMOTE_ADDR')))
+    return ip_hashes
+
+def get_submit_rate_limiter():
+    """One IP address can only submit 5 feedback within 24 hours."""
+    if getattr(settings, 'FEEDBACK_RATE_LIMIT_BACKEND', 'database') == 'cache':
+        backend = CacheBackend()
+    else:
+        backend = DatabaseBackend(SubmittedIpRecord, key_field='ip_hash')
+    return RateLimiter('feedback-submit', 5, timedelta(hours=24), backend)
+
 # Check if the IP address exceeds daily feedback submission limit
-def _is_not_exceed_submit_limit(ip_hash):
-    # Delete SubmittedIpRecords older than a day
-    SubmittedIpRecord.objects.filter(time__lt=timezone.now() - timedelta(hours=24)).delete()
-    # Check if the IP address has already submitted 5 feedback within 24 hours
-    return len(SubmittedIpRecord.objects.filter(ip_hash=ip_hash)) < 5
+def _is_not_exceed_submit_limit(ip_hashes):
+    return get_submit_rate_limiter().is_allowed(ip_hashes)
 
 @login_required
 def submit(request):
     if request.method == 'POST':
         # Check if the IP address exceeds daily feedback submission limit
         ip_hash = _get_ip_hash(request)
-        if not _is_not_exceed_submit_limit(ip_hash):
+        if not _is_not_exceed_submit_limit(_get_ip_hashes(request)):
             messages.error(request, 'Failed to submit feedback, one IP address can only submit 5 feedback within 24 hours. Please try again later.')
             return redirect('feedback:submit')
 
@@ -72,8 +96,7 @@ def submit(request):
             feedback.save()
 
             # Record IP hash
-            submitted_ip_record = SubmittedIpRecord(ip_hash=ip_hash)
-            submitted_ip_record.save()
+            get_submit_rate_limiter().hit(ip_hash)
 
             if request.user.has_perm('feedback.add_response'):
                 messages.success(request, 'Your feedback has been successfully submitted.')
@@ -94,7 +117,7 @@ def submit(request):
                 return render(request, 'feedback/submit_failed.html')
 
         # Check if exceeded submission limit
-        if not _is_not_exceed_submit_limit(_get_ip_hash(request)):
+        if not _is_not_exceed_submit_limit(_get_ip_hashes(request)):
             return render(request, 'feedback/submit_limit_exceeded.html')
 
         submit_form = SubmitForm()
@@ -107,17 +130,21 @@ def submit(request):
 @login_required
 def view(request):
     # Show all feedback committee only, show feedback with response to everyone
-    if request.user.has_perm('feedback.add_response'):
-        feedbacks = Feedback.objects.all().order_by('-time', '-id')
-    else:
-        feedbacks = Feedback.objects.exclude(response__isnull=True).order_by('-time', '-id')
+    feedbacks = Feedback.objects.select_related('response', 'category')
+    if not request.user.has_perm('feedback.add_response'):
+        feedbacks = feedbacks.filter(response__isnull=False)
 
     # Show 10 feedback per page
-    paginator = Paginator(feedbacks, 10)
-    page_num = request.GET.get('page')
-    page = paginator.get_page(page_num)
+    if 'page' in request.GET:
+        # Numbered pages, kept for old links
+        paginator = Paginator(feedbacks.order_by('-time', '-id'), 10)
+        page_num = request.GET.get('page')
+        page = paginator.get_page(page_num)
 
-    page_range = _get_page_range(page.number, paginator.num_pages, 3)
+        page_range = _get_page_range(page.number, paginator.num_pages, 3)
+    else:
+        page = keyset_paginate(feedbacks, ('time', 'id'), 10, before=request.GET.get('before'), after=request.GET.get('after'))
+        page_range = None
 
     context = {
         'feedbacks': page,
@@ -126,6 +153,28 @@ def view(request):
     return render(request, 'feedback/view.html', context)
 
 
+@login_required
+def search(request):
+    query = request.GET.get('q', '').strip()
+    # Same visibility as the feedback list
+    feedbacks = Feedback.objects.select_related('response', 'category')
+    if not request.user.has_perm('feedback.add_response'):
+        feedbacks = feedbacks.filter(response__isnull=False)
+
+    # Show 10 feedback per page as in the feedback list
+    if query:
+        results = feedback_search.search(feedbacks, query, 10, before=request.GET.get('before'), after=request.GET.get('after'))
+    else:
+        results = []
+
+    context = {
+        'feedbacks': results,
+        'page_range': None,
+        'query': query,
+    }
+    return render(request, 'feedback/view.html', context)
+
+
 @login_required
 @permission_required('feedback.add_response', raise_exception=True)
 def respond(request, feedback_uuid):
@@ -149,10 +198,7 @@ def respond(request, feedback_uuid):
                 action = 'create'
             else:
                 action = 'edit'
-            feedback_auditlog = FeedbackAuditLog(action=action, user=request.user.username, feedback=feedback)
-            feedback_auditlog.save()
-            auditlog = AuditLog(content_object=feedback_auditlog)
-            auditlog.save()
+            audit.record(request.user.username, action, feedback, '{} {} a feedback response'.format(request.user.username, dict(FeedbackAuditLog.ACTIONS)[action]))
             messages.success(request, 'Your response was saved successfully.')
             return redirect('feedback:view')
 
@@ -160,10 +206,7 @@ def respond(request, feedback_uuid):
         try:
             response = feedback.response
             response.delete()
-            feedback_auditlog = FeedbackAuditLog(action='delete', user=request.user.username, feedback=feedback)
-            feedback_auditlog.save()
-            auditlog = AuditLog(content_object=feedback_auditlog)
-            auditlog.save()
+            audit.record(request.user.username, 'delete', feedback, '{} deleted a feedback response'.format(request.user.username))
             messages.success(request, 'The response has been deleted successfully.')
         except:
             messages.warning(request, 'The response requested to be deleted does not exist, nothing has been changed.')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class JumpstartConfig(AppConfig):
     name = 'jumpstart'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Fresher, Helper
+
+from website.caching import bump_version
+
+
+@receiver(post_save, sender=Fresher)
+@receiver(post_delete, sender=Fresher)
+@receiver(post_save, sender=Helper)
+@receiver(post_delete, sender=Helper)
+def invalidate_jumpstart(sender, **kwargs):
+    # Portal pages link to Jumpstart for freshers and helpers, see portal/base.html
+    bump_version('jumpstart')
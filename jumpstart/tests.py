@@ -1,3 +1,52 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User, Group as AuthGroup
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+import os
+import shutil
+import tempfile
+
+from performance.testing import QueryBudgetMixin
+
+from .models import Jumpstart, Group, Fresher, Helper
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+
+    # Counted with the three groups of setUp, the groups page still runs queries for each group
+    query_budgets = {
+        'jumpstart:home': 17,
+        'jumpstart:groups': 20,
+        'jumpstart:committee-group': 10,
+    }
+
+    def setUp(self):
+        Jumpstart.objects.create(site_id=1, start_time=timezone.now() - timedelta(hours=1), end_time=timezone.now() + timedelta(hours=1),
+                                 helper_profile_lock_time=timezone.now() - timedelta(days=1))
+        for number in range(1, 4):
+            group = Group.objects.create(number=number, name='Group name {}'.format(number))
+            Helper.objects.create(username='helper{}'.format(number), name='Helper {}'.format(number), group=group)
+            for i in range(4):
+                Fresher.objects.create(username='fresher{}{}'.format(number, i), name='Fresher {}{}'.format(number, i), group=group)
+        self.fresher = User.objects.create_user('fresher10')
+        self.helper = User.objects.create_user('helper1')
+        self.committee_user = User.objects.create_user('committee')
+        self.committee_user.groups.add(AuthGroup.objects.create(name='committee'))
+
+    def test_query_budgets(self):
+        # Helpers are shown the info from the data directory
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        os.makedirs(os.path.join(base_dir, 'jumpstart', 'data'))
+        with open(os.path.join(base_dir, 'jumpstart', 'data', 'helper-info.md'), 'w') as info_file:
+            info_file.write('Helper info\n')
+
+        for user in (self.fresher, self.helper):
+            self.client.force_login(user)
+            with override_settings(BASE_DIR=base_dir):
+                self.assertContains(self.client.get('/portal/jumpstart/'), 'Helper 1')
+        self.client.force_login(self.committee_user)
+        self.assertEqual(self.client.get('/portal/jumpstart/').status_code, 200)
+        self.assertContains(self.client.get('/portal/jumpstart/groups/', {'show_members': 'yes'}), 'Fresher 10')
+        self.assertContains(self.client.get('/portal/jumpstart/groups/1/'), 'Fresher 10')
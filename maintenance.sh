@@ -1,7 +1,8 @@
 #!/bin/bash
 source "$1bin/activate"
 
-python $2manage.py clearsessions
+python $2manage.py clearexpiredsessions
 python $2manage.py clearusers
+python $2manage.py clearsubmittedips
 
 python $2manage.py syncupcomingfbevents
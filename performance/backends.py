@@ -0,0 +1,27 @@
+from django.template.backends.django import DjangoTemplates
+
+from .recorder import measure_render
+
+
+class TimedTemplate:
+    """Template of the Django backend adding its render time to the request's measurement."""
+
+    def __init__(self, template):
+        self._template = template
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None):
+        with measure_render():
+            return self._template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend timing the templates it renders, see PerformanceMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
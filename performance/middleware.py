@@ -0,0 +1,60 @@
+from django.conf import settings
+
+import json
+import logging
+import time
+
+from . import recorder
+from .signals import SERVER_TIMING_SESSION_KEY
+
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    """Measure the time, database queries, template rendering and response size of each request.
+
+       Every request is logged as a line of JSON and added to the totals of its view shown on the performance dashboard.
+       Committee members also get the numbers in a Server-Timing header, shown by the browser's developer tools,
+       membership is checked when they log in.
+       Template render times need the TimedDjangoTemplates backend.
+       With PERFORMANCE_RECORD_QUERIES (DEBUG by default), queries of the same shape run more than
+       PERFORMANCE_REPEATED_QUERY_THRESHOLD times in a request, usually lazy loading in a loop, are logged with their call sites.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with recorder.measure() as measurement:
+            response = self.get_response(request)
+        time_ms = (time.perf_counter() - start) * 1000
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match is not None else 'unresolved'
+        size = None if response.streaming else len(response.content)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'time_ms': round(time_ms, 2),
+            'queries': measurement.queries,
+            'query_ms': round(measurement.query_time, 2),
+            'render_ms': round(measurement.render_time, 2),
+            'size': size,
+        }))
+        recorder.add(view_name, time_ms, measurement, size)
+        if measurement.recorded_queries is not None:
+            threshold = getattr(settings, 'PERFORMANCE_REPEATED_QUERY_THRESHOLD', 5)
+            for shape, call_sites in measurement.get_repeated_queries(threshold):
+                logger.warning('%s ran %d queries of the same shape, from %s: %s', view_name, len(call_sites), ', '.join(sorted(set(call_sites))), shape)
+        recorder.request_measured.send(sender=self.__class__, request=request, view_name=view_name, measurement=measurement)
+
+        session = getattr(request, 'session', None)
+        # Anonymous visitors without a session are not marked as accessing it
+        if session is not None and session.session_key is not None and session.get(SERVER_TIMING_SESSION_KEY, False):
+            response['Server-Timing'] = 'total;dur={:.1f}, db;dur={:.1f};desc="{} queries", render;dur={:.1f}'.format(
+                time_ms, measurement.query_time, measurement.queries, measurement.render_time)
+        return response
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200, unique=True)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('total_time', models.FloatField(default=0)),
+                ('max_time', models.FloatField(default=0)),
+                ('total_queries', models.PositiveIntegerField(default=0)),
+                ('total_query_time', models.FloatField(default=0)),
+                ('total_render_time', models.FloatField(default=0)),
+                ('total_size', models.BigIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ViewTimeBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upper_bound', models.PositiveIntegerField(null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('view_stats', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='performance.ViewStats')),
+            ],
+            options={
+                'unique_together': {('view_stats', 'upper_bound')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class ViewStats(models.Model):
+    """Totals of the requests to a view, added to by performance.recorder.flush."""
+    view_name = models.CharField(max_length=200, unique=True)
+    requests = models.PositiveIntegerField(default=0)
+    # Times in milliseconds
+    total_time = models.FloatField(default=0)
+    max_time = models.FloatField(default=0)
+    total_queries = models.PositiveIntegerField(default=0)
+    total_query_time = models.FloatField(default=0)
+    total_render_time = models.FloatField(default=0)
+    # Bytes of non-streaming responses
+    total_size = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.view_name
+
+
+class ViewTimeBucket(models.Model):
+    """Number of requests to a view taking at most upper_bound milliseconds, and more than the next bound down."""
+    view_stats = models.ForeignKey(ViewStats, on_delete=models.CASCADE, related_name='buckets')
+    # Null for the requests slower than the largest bound
+    upper_bound = models.PositiveIntegerField(null=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('view_stats', 'upper_bound')
@@ -0,0 +1,214 @@
+import django
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+import os
+import re
+import sys
+import threading
+import time
+
+from .models import ViewStats, ViewTimeBucket
+
+
+# Upper bounds in milliseconds of the buckets of the request time histograms
+TIME_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+_state = threading.local()
+
+# Sent by PerformanceMiddleware after each request with request, view_name and measurement
+request_measured = Signal()
+
+
+class Measurement:
+    """Numbers recorded about one request."""
+
+    def __init__(self, record_queries=False):
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.render_depth = 0
+        # (shape, call site) of each query when recording queries
+        self.recorded_queries = [] if record_queries else None
+
+    def get_repeated_queries(self, threshold):
+        """Shapes of the queries run more than threshold times with their call sites, most repeated first."""
+        call_sites = defaultdict(list)
+        for shape, call_site in self.recorded_queries or ():
+            call_sites[shape].append(call_site)
+        repeated = [(shape, sites) for shape, sites in call_sites.items() if len(sites) > threshold]
+        return sorted(repeated, key=lambda item: -len(item[1]))
+
+
+def current():
+    """Measurement of the request handled by this thread, or None."""
+    return getattr(_state, 'measurement', None)
+
+
+def is_recording_queries():
+    return getattr(settings, 'PERFORMANCE_RECORD_QUERIES', settings.DEBUG)
+
+
+@contextmanager
+def measure():
+    """Measure the queries and template rendering of the block, e.g. a request."""
+    measurement = Measurement(record_queries=is_recording_queries())
+    previous, _state.measurement = current(), measurement
+    try:
+        with ExitStack() as stack:
+            if previous is None:
+                # Wrappers installed by the outer measurement count the queries for this one
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(query_wrapper))
+            yield measurement
+    finally:
+        _state.measurement = previous
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """Execute wrapper (see connection.execute_wrapper) counting and timing the queries of the current measurement."""
+    measurement = current()
+    if measurement is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        measurement.queries += 1
+        measurement.query_time += (time.perf_counter() - start) * 1000
+        if measurement.recorded_queries is not None:
+            measurement.recorded_queries.append((get_query_shape(sql), get_call_site()))
+
+
+_in_list = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def get_query_shape(sql):
+    """SQL of a query without the lengths of IN lists, the values are parameters already."""
+    return _in_list.sub('IN (...)', sql)
+
+
+# Installed packages, e.g. site-packages of a virtualenv in the project directory
+_libraries_dir = os.path.dirname(os.path.dirname(os.path.abspath(django.__file__)))
+
+_instrumentation_files = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in ('recorder.py', 'middleware.py', 'backends.py'))
+
+
+def get_call_site():
+    """Where the current query comes from: the template line rendering it if any, and the innermost project code."""
+    template_line = None
+    code_line = None
+    frame = sys._getframe(1)
+    while frame is not None and code_line is None:
+        file_name = frame.f_code.co_filename
+        if template_line is None and frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template_line = '{}:{}'.format(origin.template_name or origin.name, token.lineno)
+        elif file_name.startswith(str(settings.BASE_DIR)) and not file_name.startswith((_libraries_dir,) + _instrumentation_files):
+            code_line = '{}:{} in {}'.format(os.path.relpath(file_name, str(settings.BASE_DIR)), frame.f_lineno, frame.f_code.co_name)
+        frame = frame.f_back
+    return ', '.join(line for line in (template_line, code_line) if line) or 'unknown'
+
+
+@contextmanager
+def measure_render():
+    """Add the time of the block to the render time, templates rendered by other templates are only counted once."""
+    measurement = current()
+    if measurement is None:
+        yield
+        return
+    measurement.render_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        measurement.render_depth -= 1
+        if measurement.render_depth == 0:
+            measurement.render_time += (time.perf_counter() - start) * 1000
+
+
+def _new_stats():
+    return {
+        'requests': 0,
+        'total_time': 0.0,
+        'max_time': 0.0,
+        'total_queries': 0,
+        'total_query_time': 0.0,
+        'total_render_time': 0.0,
+        'total_size': 0,
+        'buckets': defaultdict(int),
+    }
+
+
+# Totals of this process not written to the database yet
+_pending = defaultdict(_new_stats)
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def get_bucket(time_ms):
+    """Upper bound of the histogram bucket of a request time, None if slower than all the bounds."""
+    index = bisect_left(TIME_BUCKETS, time_ms)
+    return TIME_BUCKETS[index] if index < len(TIME_BUCKETS) else None
+
+
+def add(view_name, time_ms, measurement, size):
+    """Add a request to the totals of its view, they are written to the database by flush_if_due."""
+    with _pending_lock:
+        stats = _pending[view_name]
+        stats['requests'] += 1
+        stats['total_time'] += time_ms
+        stats['max_time'] = max(stats['max_time'], time_ms)
+        stats['total_queries'] += measurement.queries
+        stats['total_query_time'] += measurement.query_time
+        stats['total_render_time'] += measurement.render_time
+        stats['total_size'] += size or 0
+        stats['buckets'][get_bucket(time_ms)] += 1
+
+
+def _add_to_row(model, lookup, values):
+    """Add values to the counters of a row, creating it if needed, the counters of other processes are kept."""
+    for attempt in range(2):
+        if model.objects.filter(**lookup).update(**values):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup)
+        except IntegrityError:
+            # Created by another process since
+            pass
+
+
+def flush():
+    """Write the totals of this process to the database."""
+    global _pending, _last_flush
+    with _pending_lock:
+        pending, _pending = _pending, defaultdict(_new_stats)
+        _last_flush = time.monotonic()
+    for view_name, stats in pending.items():
+        buckets = stats.pop('buckets')
+        max_time = stats.pop('max_time')
+        values = {name: F(name) + value for name, value in stats.items()}
+        values['max_time'] = Greatest(F('max_time'), max_time)
+        _add_to_row(ViewStats, {'view_name': view_name}, values)
+        view_stats_id = ViewStats.objects.only('pk').get(view_name=view_name).pk
+        for upper_bound, count in buckets.items():
+            _add_to_row(ViewTimeBucket, {'view_stats_id': view_stats_id, 'upper_bound': upper_bound}, {'count': F('count') + count})
+
+
+def flush_if_due(**kwargs):
+    """Write the totals of this process every PERFORMANCE_FLUSH_INTERVAL seconds.
+
+       Connected to request_finished, so the writes happen after the response is sent.
+    """
+    if time.monotonic() - _last_flush >= getattr(settings, 'PERFORMANCE_FLUSH_INTERVAL', 60):
+        flush()
@@ -0,0 +1,19 @@
+from django.contrib.auth.signals import user_logged_in
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from . import recorder
+
+
+# Session key of whether the user gets the Server-Timing header, see PerformanceMiddleware
+SERVER_TIMING_SESSION_KEY = 'performance_server_timing'
+
+
+@receiver(user_logged_in)
+def remember_server_timing(sender, request, user, **kwargs):
+    # Checked once at login instead of querying the groups on every request
+    if request is not None and hasattr(request, 'session'):
+        request.session[SERVER_TIMING_SESSION_KEY] = user.groups.filter(name='committee').exists()
+
+
+request_finished.connect(recorder.flush_if_due)
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.test.utils import override_settings
+
+import logging
+
+from . import recorder
+
+
+def _without_warnings(record):
+    return record.levelno < logging.WARNING
+
+
+class QueryBudgetMixin:
+    """TestCase mixin failing requests of the test client running more queries than the budget of their view.
+
+       The failure lists the queries run more than PERFORMANCE_REPEATED_QUERY_THRESHOLD times with their call sites,
+       which are not logged as warnings while the tests run, needs PerformanceMiddleware.
+    """
+
+    # View names, e.g. 'shop:item', to the most queries a request to the view may run
+    query_budgets = {}
+
+    # Budget of the views not in query_budgets, None for no limit
+    default_query_budget = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._record_queries = override_settings(PERFORMANCE_RECORD_QUERIES=True)
+        cls._record_queries.enable()
+        recorder.request_measured.connect(cls._check_query_budget, dispatch_uid=cls)
+        # Repeated queries are only shown in the failure message, not logged for every request
+        logging.getLogger('performance.middleware').addFilter(_without_warnings)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.getLogger('performance.middleware').removeFilter(_without_warnings)
+        recorder.request_measured.disconnect(dispatch_uid=cls)
+        cls._record_queries.disable()
+        super().tearDownClass()
+
+    @classmethod
+    def _check_query_budget(cls, view_name, measurement, **kwargs):
+        budget = cls.query_budgets.get(view_name, cls.default_query_budget)
+        if budget is None or measurement.queries <= budget:
+            return
+        message = '{} ran {} queries, over its budget of {}'.format(view_name, measurement.queries, budget)
+        threshold = getattr(settings, 'PERFORMANCE_REPEATED_QUERY_THRESHOLD', 5)
+        for shape, call_sites in measurement.get_repeated_queries(threshold):
+            message += '\n{} times from {}: {}'.format(len(call_sites), ', '.join(sorted(set(call_sites))), shape)
+        raise AssertionError(message)
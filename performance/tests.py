@@ -0,0 +1,108 @@
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.template import Context, Template
+
+from website.caching import get_version
+
+import json
+
+from .models import ViewStats
+from .testing import QueryBudgetMixin
+from . import recorder
+
+
+class PerformanceMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        recorder.flush()
+        ViewStats.objects.all().delete()
+        self.user = User.objects.create_user('test')
+
+    def test_log(self):
+        with self.assertLogs('performance.middleware', 'INFO') as logs:
+            response = self.client.get('/about/')
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['view'], 'website:about')
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['size'], len(response.content))
+        self.assertGreater(line['render_ms'], 0)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_server_timing(self):
+        self.client.force_login(self.user)
+        self.assertNotIn('Server-Timing', self.client.get('/about/'))
+        # Test membership is checked at login
+        self.user.groups.add(Group.objects.create(name='committee'))
+        self.assertNotIn('Server-Timing', self.client.get('/about/'))
+        self.client.force_login(self.user)
+        # Test the groups are not queried, only the versions and the user
+        with self.assertNumQueries(2):
+            self.assertIn('db;dur=', self.client.get('/about/')['Server-Timing'])
+
+    def test_dashboard(self):
+        self.client.get('/about/')
+        self.client.get('/about/')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/portal/performance/').status_code, 404)
+
+        self.user.groups.add(Group.objects.create(name='committee'))
+        response = self.client.get('/portal/performance/')
+        self.assertContains(response, 'website:about')
+        view_stats = ViewStats.objects.get(view_name='website:about')
+        self.assertEqual(view_stats.requests, 2)
+        self.assertEqual(sum(bucket.count for bucket in view_stats.buckets.all()), 2)
+
+        # Test totals are added to by later flushes
+        self.client.get('/about/')
+        recorder.flush()
+        self.assertEqual(ViewStats.objects.get(view_name='website:about').requests, 3)
+
+    def test_flush_after_response(self):
+        with self.settings(PERFORMANCE_FLUSH_INTERVAL=0):
+            self.client.get('/about/')
+        self.assertEqual(ViewStats.objects.get(view_name='website:about').requests, 1)
+
+
+class RepeatedQueriesTestCase(TestCase):
+
+    def test_repeated_queries(self):
+        users = [User.objects.create_user('test{}'.format(i)) for i in range(6)]
+        with self.settings(PERFORMANCE_RECORD_QUERIES=True), recorder.measure() as measurement:
+            for user in users:
+                User.objects.get(pk=user.pk)
+            User.objects.filter(pk__in=[user.pk for user in users[:2]]).exists()
+            User.objects.filter(pk__in=[user.pk for user in users]).exists()
+        repeated_queries = measurement.get_repeated_queries(5)
+        self.assertEqual(len(repeated_queries), 1)
+        shape, call_sites = repeated_queries[0]
+        self.assertEqual(len(call_sites), 6)
+        self.assertIn('performance/tests.py', call_sites[0])
+        self.assertIn('in test_repeated_queries', call_sites[0])
+        # Test IN lists of different lengths have the same shape
+        self.assertEqual(len(measurement.get_repeated_queries(1)), 2)
+
+    def test_template_call_site(self):
+        with self.settings(PERFORMANCE_RECORD_QUERIES=True), recorder.measure() as measurement:
+            Template('{% for group in user.groups.all %}{% endfor %}').render(Context({'user': User.objects.create_user('test')}))
+        self.assertTrue(measurement.recorded_queries[-1][1].startswith('<unknown source>:1, performance/tests.py:'))
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+
+    query_budgets = {
+        'website:about': 1,
+        'performance:dashboard': 2,
+    }
+
+    def test_query_budget(self):
+        # Versions are created when first read
+        for scope in ('content', 'auth'):
+            get_version(scope)
+        self.client.get('/about/')
+        user = User.objects.create_user('test')
+        user.groups.add(Group.objects.create(name='committee'))
+        self.client.force_login(user)
+        with self.assertRaisesMessage(AssertionError, 'performance:dashboard ran'), self.assertLogs('django.request', 'ERROR'):
+            self.client.get('/portal/performance/')
@@ -0,0 +1,48 @@
+from django.shortcuts import render, Http404
+from django.contrib.auth.decorators import login_required
+
+from .models import ViewStats
+from .recorder import TIME_BUCKETS, flush
+
+
+def _get_percentile(buckets, requests, fraction):
+    """Upper bound of the bucket holding the given fraction of the requests, None if slower than all the bounds."""
+    seen = 0
+    for upper_bound in TIME_BUCKETS:
+        seen += buckets.get(upper_bound, 0)
+        if seen >= requests * fraction:
+            return upper_bound
+    return None
+
+
+@login_required
+def dashboard(request):
+    if not request.user.groups.filter(name='committee').exists():
+        raise Http404()
+    # Include the requests of this process not written yet
+    flush()
+
+    views = []
+    for view_stats in ViewStats.objects.prefetch_related('buckets').order_by('-total_time'):
+        buckets = {}
+        for bucket in view_stats.buckets.all():
+            buckets[bucket.upper_bound] = buckets.get(bucket.upper_bound, 0) + bucket.count
+        requests = view_stats.requests or 1
+        views.append({
+            'name': view_stats.view_name,
+            'requests': view_stats.requests,
+            'mean_time': view_stats.total_time / requests,
+            'p50_time': _get_percentile(buckets, requests, 0.5),
+            'p95_time': _get_percentile(buckets, requests, 0.95),
+            'max_time': view_stats.max_time,
+            'mean_queries': view_stats.total_queries / requests,
+            'mean_query_time': view_stats.total_query_time / requests,
+            'mean_render_time': view_stats.total_render_time / requests,
+            'mean_size': view_stats.total_size / requests,
+            'histogram': [(upper_bound, buckets.get(upper_bound, 0), 100 * buckets.get(upper_bound, 0) / requests) for upper_bound in TIME_BUCKETS + (None,)],
+        })
+    context = {
+        'views': views,
+        'largest_bound': TIME_BUCKETS[-1],
+    }
+    return render(request, 'performance/dashboard.html', context)
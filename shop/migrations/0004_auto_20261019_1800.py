@@ -0,0 +1,95 @@
+# Generated by Django 2.2.5 on 2026-10-19 18:00
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_auto_20181029_1828'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Basket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=50)),
+                ('delivery_option', models.IntegerField(choices=[(1, 'Collection'), (2, 'UK Delivery')], default=1)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DeliveryAddress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, null=True)),
+                ('city', models.CharField(max_length=50, null=True)),
+                ('country', models.CharField(max_length=2, null=True)),
+                ('line1', models.CharField(max_length=50, null=True)),
+                ('line2', models.CharField(max_length=50, null=True)),
+                ('postal_code', models.CharField(max_length=50, null=True)),
+                ('state', models.CharField(max_length=50, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=50)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('delivery_option', models.IntegerField(choices=[(1, 'Collection'), (2, 'UK Delivery')], default=1)),
+                ('address', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='shop.DeliveryAddress')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Transaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe_id', models.CharField(max_length=50, null=True)),
+                ('status', models.IntegerField(choices=[(1, 'Open'), (2, 'Processed')], default=1)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='short_description',
+            field=models.TextField(default='', verbose_name='item short description'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='itemimage',
+            name='front_page',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='itemimage',
+            name='item_options',
+            field=models.ManyToManyField(blank=True, null=True, to='shop.OptionChoice'),
+        ),
+        migrations.CreateModel(
+            name='OrderedItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('choices', models.ManyToManyField(to='shop.OptionChoice')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='shop.Item')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='shop.Order')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='transaction',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='shop.Transaction'),
+        ),
+        migrations.CreateModel(
+            name='BasketedItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('basket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='shop.Basket')),
+                ('choices', models.ManyToManyField(to='shop.OptionChoice')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='shop.Item')),
+            ],
+        ),
+    ]
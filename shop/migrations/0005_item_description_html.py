@@ -0,0 +1,35 @@
+# Generated by Django 2.2.5 on 2026-10-19 18:10
+
+from django.db import migrations
+import website.fields
+
+
+def render_descriptions(apps, schema_editor):
+    from website.rendering import render_markdown
+    Item = apps.get_model('shop', 'Item')
+    items = list(Item.objects.only('id', 'short_description', 'description'))
+    for item in items:
+        item.short_description_html = render_markdown(item.short_description) if item.short_description else ''
+        item.description_html = render_markdown(item.description) if item.description else ''
+    Item.objects.bulk_update(items, ['short_description_html', 'description_html'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_auto_20261019_1800'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='description_html',
+            field=website.fields.RenderedMarkdownField(source_field='description'),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='short_description_html',
+            field=website.fields.RenderedMarkdownField(source_field='short_description'),
+        ),
+        migrations.RunPython(render_descriptions, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,8 @@ import uuid
 
 from django.contrib.auth.models import Permission
 
+from website.fields import RenderedMarkdownField
+
 
 def item_image_file_name(instance, filename):
     return ('shop/{}/{}-{}{}'.format(instance.item.sale.codename, instance.item.codename, uuid.uuid4(), os.path.splitext(filename)[1].lower()))
@@ -53,7 +55,9 @@ class Item(models.Model):
     codename = models.CharField(max_length=50)
     name = models.CharField(max_length=50, verbose_name='item name')
     short_description = models.TextField(verbose_name='item short description')
+    short_description_html = RenderedMarkdownField(source_field='short_description')
     description = models.TextField(verbose_name='item description')
+    description_html = RenderedMarkdownField(source_field='description')
     price = models.DecimalField(max_digits=6, decimal_places=2, verbose_name='item price')
     sort_order = models.IntegerField(null=True, blank=True, verbose_name='item sort order')
     sale = models.ForeignKey(Sale, on_delete=models.PROTECT)
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Sale, Item, ItemOption, OptionChoice, ItemImage, ItemPermission
+
+from website.caching import bump_version
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+@receiver(post_save, sender=ItemOption)
+@receiver(post_delete, sender=ItemOption)
+@receiver(post_save, sender=OptionChoice)
+@receiver(post_delete, sender=OptionChoice)
+@receiver(post_save, sender=ItemImage)
+@receiver(post_delete, sender=ItemImage)
+@receiver(post_save, sender=ItemPermission)
+@receiver(post_delete, sender=ItemPermission)
+def invalidate_shop(sender, **kwargs):
+    bump_version('shop')
@@ -1,3 +1,42 @@
 from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+
+from performance.testing import QueryBudgetMixin
+from website.caching import get_version, get_user_auth_version
+
+from .models import Sale, Item, ItemImage, ItemOption, OptionChoice
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+
+    # Counted with the three items of setUp, the shop page still runs queries for each item
+    query_budgets = {
+        'shop:shop': 31,
+        'shop:item': 16,
+    }
+
+    def setUp(self):
+        # Versions are created when first read
+        for scope in ('shop', 'jumpstart', 'auth'):
+            get_version(scope)
+        self.sale = Sale.objects.create(codename='merch', name='Merch', start=timezone.now() - timedelta(days=1), end=timezone.now() + timedelta(days=1))
+        for i in range(3):
+            item = Item.objects.create(codename='item{:02}'.format(i), name='Item {:02}'.format(i), short_description='**Short**', description='Description', price='10.00', sort_order=i, sale=self.sale, paypal_button_id='')
+            ItemImage.objects.create(item=item, image='shop/merch/item{:02}.jpg'.format(i), sort_order=1)
+            option = ItemOption.objects.create(item=item, paypal_option_number=1, paypal_option_name='os0', name='Size')
+            for size in ('S', 'M', 'L'):
+                OptionChoice.objects.create(item_option=option, name=size, value=size)
+        self.user = User.objects.create_user('test')
+        self.committee_user = User.objects.create_user('committee')
+        self.committee_user.groups.add(Group.objects.create(name='committee'))
+        for user in (self.user, self.committee_user):
+            get_user_auth_version(user.pk)
+
+    def test_query_budgets(self):
+        for user in (self.user, self.committee_user):
+            self.client.force_login(user)
+            self.assertContains(self.client.get('/portal/shop/'), 'Item 00')
+            self.assertContains(self.client.get('/portal/shop/merch/item00/'), 'Item 00')
@@ -7,12 +7,12 @@ from django.db.models import Q
 from django.conf import settings
 import itertools
 
-import yaml
-import os
-
 from .models import Sale, Item, Basket, BasketedItem, ItemOption, OptionChoice, Transaction, Order, OrderedItem, DeliveryAddress
 from .utils import has_any_perms_item
 
+from website.datafiles import load_data_file
+from website.conditional import versions_condition
+
 import stripe
 stripe.api_key = settings.SHOP_STRIPE_API_KEY
 
@@ -71,7 +71,12 @@ def stripe_webhook(request):
 
   return HttpResponse(status=200)
 
+def _get_sale_times():
+    # Sales appear and disappear when they start and end
+    return [time for sale in Sale.objects.only('start', 'end') for time in (sale.start, sale.end)]
+
 @login_required
+@versions_condition('shop', 'jumpstart', transitions=_get_sale_times)
 def shop(request, sale=None):
     # show all current and future sales for committee
     if request.user.groups.filter(name='committee').exists():
@@ -156,6 +161,7 @@ def orders(request):
     return render(request, 'shop/orders.html', context)
 
 @login_required
+@versions_condition('shop', 'jumpstart', transitions=_get_sale_times)
 def item(request, sale, item):
     sale = get_object_or_404(Sale, codename=sale)
     # do not show past sales items
@@ -317,9 +323,8 @@ def merch2023_category(request, category):
     if sale.start > timezone.now() and not request.user.groups.filter(name='committee').exists():
         raise Http404()
 
-    with open(os.path.join(settings.BASE_DIR, 'shop/data/merch2023.yaml')) as data_file:
-        data = yaml.safe_load(data_file)
-        items = Item.objects.filter(Q(sale='ecss-merch-2023') & Q(codename__in=data[category]))
+    data = load_data_file('shop/data/merch2023.yaml')
+    items = Item.objects.filter(Q(sale='ecss-merch-2023') & Q(codename__in=data[category]))
 
     category_names = {
         'tshirts': 'T-shirts',
@@ -346,9 +351,8 @@ def merch1819_category(request, category):
     if sale.start > timezone.now() and not request.user.groups.filter(name='committee').exists():
         raise Http404()
 
-    with open(os.path.join(settings.BASE_DIR, 'shop/data/merch1819.yaml')) as data_file:
-        data = yaml.load(data_file)
-        items = Item.objects.filter(Q(sale='ecss-merch-2018-19') & Q(codename__in=data[category]))
+    data = load_data_file('shop/data/merch1819.yaml')
+    items = Item.objects.filter(Q(sale='ecss-merch-2018-19') & Q(codename__in=data[category]))
 
     category_names = {
         'tshirts': 'T-shirts',
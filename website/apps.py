@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class WebsiteConfig(AppConfig):
     name = 'website'
+
+    def ready(self):
+        from . import signals
+        signals.connect_image_receivers()
@@ -0,0 +1,157 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_started, request_finished
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.http import HttpResponse
+from django.utils import timezone
+
+from functools import wraps
+import hashlib
+import threading
+import time
+
+from .datafiles import get_files_fingerprint
+from .models import Version
+
+
+PAGE_CACHE_KEY = 'website:page:{}:{}'
+
+CONTENT_CACHE_KEY = 'website:content:{}:{}'
+
+USER_AUTH_SCOPE = 'auth:{}'
+
+
+def _get_cache():
+    return caches[getattr(settings, 'WEBSITE_PAGE_CACHE', 'default')]
+
+
+# Version rows read by the request handled by this thread
+_state = threading.local()
+
+
+def _start_request(**kwargs):
+    _state.in_request = True
+    _state.versions = None
+
+
+def _finish_request(**kwargs):
+    _state.in_request = False
+    _state.versions = None
+
+
+request_started.connect(_start_request)
+request_finished.connect(_finish_request)
+
+
+def _get_version_row(scope):
+    """Version row of a scope, the rows of the apps are read once per request.
+
+       Scopes of single objects, e.g. 'auth:<user pk>', are read with them when asked for first, else when used.
+    """
+    in_request = getattr(_state, 'in_request', False)
+    if in_request:
+        if _state.versions is None:
+            _state.versions = Version.objects.filter(~Q(scope__contains=':') | Q(scope=scope)).in_bulk()
+        row = _state.versions.get(scope)
+        if row is None and ':' in scope:
+            row = Version.objects.filter(scope=scope).first()
+            if row is not None:
+                _state.versions[scope] = row
+    else:
+        row = Version.objects.filter(scope=scope).first()
+    if row is None:
+        # Start from the current time so a version is never reused after the rows are deleted
+        try:
+            with transaction.atomic():
+                row = Version.objects.create(scope=scope, version=int(time.time()), modified=timezone.now())
+        except IntegrityError:
+            # Created by another process since
+            row = Version.objects.get(scope=scope)
+        if in_request:
+            _state.versions[scope] = row
+    return row
+
+
+def get_version(scope):
+    """Version of the data of a scope, e.g. an app, bumped by bump_version whenever the data changes.
+
+       Versions are kept in the database so every process sees the bumps of the others, e.g. of cron jobs.
+    """
+    return _get_version_row(scope).version
+
+
+def bump_version(scope):
+    if not Version.objects.filter(scope=scope).update(version=F('version') + 1, modified=timezone.now()):
+        _get_version_row(scope)
+    # Read the new version in the rest of the request
+    _state.versions = None
+
+
+def get_user_auth_version(user_pk):
+    """Version of the groups and permissions of a user."""
+    return get_version(USER_AUTH_SCOPE.format(user_pk))
+
+
+def bump_user_auth_version(user_pk):
+    bump_version(USER_AUTH_SCOPE.format(user_pk))
+
+
+def get_content_version():
+    """Version of the committee, societies and sponsors content, bumped whenever any of them changes."""
+    return get_version('content')
+
+
+def get_content_modified():
+    """Time the committee, societies or sponsors last changed, or when the version was first read if later."""
+    return _get_version_row('content').modified
+
+
+def bump_content_version():
+    bump_version('content')
+
+
+def get_or_set_content(name, default):
+    """Get data built from the committee, societies or sponsors, calling default to build it once per content version."""
+    return _get_cache().get_or_set(CONTENT_CACHE_KEY.format(get_content_version(), name), default, getattr(settings, 'WEBSITE_PAGE_CACHE_TIMEOUT', 86400))
+
+
+def cache_public_page(view=None, query_params=(), files=()):
+    """Cache the whole page for anonymous users until the content version or the data files change.
+
+       Pages are keyed by their host and path, so only use this on views rendering nothing specific to the visitor.
+       query_params: names of the query parameters the page depends on, others are ignored
+       files: paths of data files the page is built from, relative to BASE_DIR
+       Use as @cache_public_page or @cache_public_page(query_params=('sponsor',)).
+    """
+    if view is None:
+        return lambda view: cache_public_page(view, query_params=query_params, files=files)
+
+    @wraps(view)
+    def wrapped_view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        cache = _get_cache()
+        page = '{}://{}{}?{}:{}'.format(
+            request.scheme,
+            request.get_host(),
+            request.path,
+            '&'.join('{}={}'.format(name, value) for name in query_params for value in request.GET.getlist(name)),
+            get_files_fingerprint(files),
+        )
+        cache_key = PAGE_CACHE_KEY.format(get_content_version(), hashlib.md5(page.encode('utf-8')).hexdigest())
+        cached_page = cache.get(cache_key)
+        if cached_page is not None:
+            return HttpResponse(cached_page['content'], content_type=cached_page['content_type'])
+
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            cache.set(cache_key, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+            }, getattr(settings, 'WEBSITE_PAGE_CACHE_TIMEOUT', 86400))
+        return response
+    return wrapped_view
@@ -0,0 +1,16 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def write_precompressed(file_name, content):
+    """Write gzip (and brotli if installed) compressed copies of content next to file_name, for e.g. nginx gzip_static."""
+    # No timestamp, so unchanged files are byte for byte identical
+    with gzip.GzipFile(file_name + '.gz', 'wb', compresslevel=9, mtime=0) as gz_file:
+        gz_file.write(content)
+    if brotli is not None:
+        with open(file_name + '.br', 'wb') as br_file:
+            br_file.write(brotli.compress(content))
@@ -0,0 +1,91 @@
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from bisect import bisect_right
+from functools import lru_cache, wraps
+import hashlib
+import os
+
+from .caching import get_version, get_user_auth_version, _get_cache
+from .datafiles import get_files_fingerprint
+
+
+TRANSITIONS_CACHE_KEY = 'website:transitions:{}'
+
+
+@lru_cache(maxsize=None)
+def get_code_fingerprint():
+    """Fingerprint of the Python code and templates of the project's apps, so a deploy changes every ETag."""
+    files = []
+    for app_config in apps.get_app_configs():
+        if not app_config.path.startswith(str(settings.BASE_DIR)):
+            continue
+        for dir_path, dir_names, file_names in os.walk(app_config.path):
+            dir_names[:] = [dir_name for dir_name in dir_names if dir_name not in ('__pycache__', 'static', 'migrations')]
+            for file_name in file_names:
+                if file_name.endswith(('.py', '.html')):
+                    stat = os.stat(os.path.join(dir_path, file_name))
+                    files.append('{}:{}:{}'.format(os.path.join(dir_path, file_name), stat.st_mtime_ns, stat.st_size))
+    return hashlib.sha1('\n'.join(sorted(files)).encode('utf-8')).hexdigest()[:12]
+
+
+def _get_phase(versions, transitions):
+    """Number of the times from transitions() that have passed, the times are cached with the versions."""
+    cache = _get_cache()
+    cache_key = TRANSITIONS_CACHE_KEY.format(hashlib.md5(':'.join(versions).encode('utf-8')).hexdigest())
+    times = cache.get(cache_key)
+    if times is None:
+        times = sorted(time.timestamp() for time in transitions() if time is not None)
+        cache.set(cache_key, times, getattr(settings, 'WEBSITE_PAGE_CACHE_TIMEOUT', 86400))
+    return bisect_right(times, timezone.now().timestamp())
+
+
+def _has_messages(request):
+    messages = getattr(request, '_messages', None)
+    # Checking the length does not mark the messages as seen
+    return messages is not None and len(messages) > 0
+
+
+def versions_condition(*scopes, transitions=None, files=(), last_modified=None):
+    """Conditional GET for a view whose page only changes with the versions of the scopes (see caching.bump_version).
+
+       The ETag is built from the versions, the user and their groups and permissions, the CSRF cookie and the code without rendering the page,
+       so browsers and proxies get a 304 response while nothing changed.
+       transitions: function returning the times the page changes at without a save, e.g. sale start and end times
+       files: paths of data files the page is built from, relative to BASE_DIR
+       last_modified: function(request, *args, **kwargs) returning the Last-Modified time, e.g. for crawlers
+       Scopes can also be functions returning a version, e.g. fbevents.utils.get_sync_version.
+    """
+    def get_etag(request, *args, **kwargs):
+        if _has_messages(request):
+            # Render the page to show the messages
+            return None
+        if request.user.is_authenticated:
+            # Only changes to the user's own groups and permissions change their pages,
+            # read first so their version comes with the versions of the scopes
+            user = '{}:{}'.format(request.user.pk, get_user_auth_version(request.user.pk))
+        else:
+            user = 'anonymous'
+        versions = [str(scope() if callable(scope) else get_version(scope)) for scope in scopes]
+        if transitions is not None:
+            versions.append(str(_get_phase(versions, transitions)))
+        # Forms in the page hold a token for the CSRF cookie, which changes on login
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+        state = '{}:{}:{}:{}'.format(user, get_version('auth'), csrf_cookie, get_files_fingerprint(files))
+        return '{}-{}-{}'.format(get_code_fingerprint(), '-'.join(versions), hashlib.md5(state.encode('utf-8')).hexdigest()[:12])
+
+    def decorator(view):
+        conditional_view = condition(etag_func=get_etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapped_view(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Revalidate with the ETag on every use
+            patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+            patch_vary_headers(response, ['Cookie'])
+            return response
+        return wrapped_view
+    return decorator
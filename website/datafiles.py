@@ -0,0 +1,46 @@
+from django.conf import settings
+
+import os
+import threading
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# Parsed data files by path, with the modification time they were parsed at
+_data_files = {}
+_data_files_lock = threading.Lock()
+
+
+def load_data_file(path):
+    """Load a YAML data file, path relative to BASE_DIR, e.g. website/data/football-positions.yaml
+
+       The parsed data is kept in memory until the file is modified, so it must not be changed by the caller.
+       Raises OSError if the file cannot be read.
+    """
+    path = os.path.join(settings.BASE_DIR, path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _data_files.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path) as data_file:
+        data = yaml.load(data_file, Loader=SafeLoader)
+    with _data_files_lock:
+        _data_files[path] = (mtime, data)
+    return data
+
+
+def get_files_fingerprint(paths):
+    """Modification times of files, paths relative to BASE_DIR, to tell when any of them changes."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(str(os.stat(os.path.join(settings.BASE_DIR, path)).st_mtime_ns))
+        except OSError:
+            mtimes.append('-')
+    return ':'.join(mtimes)
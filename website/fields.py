@@ -0,0 +1,41 @@
+from django.db import models
+
+from .rendering import render_markdown
+
+
+class RenderedMarkdownField(models.TextField):
+    """Sanitised html of a Markdown field of the same model, rendered when the model is saved.
+
+       source_field: name of the Markdown field
+       linkify: convert URLs and email addresses into links
+
+       The html is not updated by QuerySet.update(), bulk_update() or save(update_fields=...) without this field,
+       run `python manage.py rerendermarkdown` after changing the source in these ways or changing the sanitising rules.
+    """
+
+    def __init__(self, source_field=None, linkify=True, **kwargs):
+        self.source_field = source_field
+        self.linkify = linkify
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('default', '')
+        kwargs.setdefault('editable', False)
+        super().__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source_field'] = self.source_field
+        if not self.linkify:
+            kwargs['linkify'] = False
+        for key, value in (('blank', True), ('default', ''), ('editable', False)):
+            if kwargs.get(key) == value:
+                del kwargs[key]
+        return name, path, args, kwargs
+
+    def render(self, model_instance):
+        source = getattr(model_instance, self.source_field)
+        return render_markdown(source, linkify=self.linkify) if source else ''
+
+    def pre_save(self, model_instance, add):
+        html = self.render(model_instance)
+        setattr(model_instance, self.attname, html)
+        return html
@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+
+# Formats uploads are re-encoded in, other formats are converted to JPEG
+UPLOAD_FORMATS = ('JPEG', 'PNG')
+
+# Extension of the resized copies to their format and encoding options
+RENDITION_FORMATS = {
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', {'optimize': True}),
+    'webp': ('WEBP', {'quality': 80}),
+}
+
+RENDITIONS_CACHE_KEY = 'images:renditions:{}'
+
+
+def get_max_dimension():
+    return getattr(settings, 'IMAGE_MAX_DIMENSION', 2048)
+
+
+def get_image_workers():
+    return getattr(settings, 'IMAGE_WORKERS', 2)
+
+
+def get_rendition_widths():
+    return getattr(settings, 'IMAGE_RENDITION_WIDTHS', (400, 800))
+
+
+def open_image(image_file, max_dimension=None):
+    """Open an image rotated according to its EXIF orientation and scaled down to fit in max_dimension.
+
+       JPEG images are decoded at a reduced scale when possible, which is much faster and uses less memory
+       than decoding the full image and resizing it.
+    """
+    if max_dimension is None:
+        max_dimension = get_max_dimension()
+    image = Image.open(image_file)
+    image_format = image.format
+    if image_format == 'JPEG':
+        image.draft('RGB', (max_dimension, max_dimension))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    # exif_transpose returns a copy without the format when the image is rotated
+    image.format = image_format
+    return image
+
+
+def encode_image(image, image_format, **options):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image_format == 'WEBP' and image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    image_io = io.BytesIO()
+    # EXIF data is not copied
+    image.save(image_io, image_format, **options)
+    return image_io.getvalue()
+
+
+def get_rendition_name(name, width, extension):
+    """Name of a resized copy of an image, e.g. renditions/election/agm/photo-400.webp for election/agm/photo.jpg"""
+    root = os.path.splitext(name)[0]
+    return 'renditions/{}-{}.{}'.format(root, width, extension)
+
+
+def get_fallback_extension(name):
+    """Extension of the copies for browsers without WebP, PNG to keep the transparency of PNG images."""
+    return 'png' if name.lower().endswith('.png') else 'jpg'
+
+
+def generate_renditions(storage, name):
+    """Save the resized WebP copies of an image and JPEG (or PNG) copies for other browsers, returns the names of the copies saved."""
+    with storage.open(name) as image_file:
+        image = open_image(image_file, max(get_rendition_widths()))
+    names = []
+    # The largest WebP copy is saved last, get_srcset checks it to tell whether all copies exist
+    for width in sorted(get_rendition_widths()):
+        rendition = image
+        if image.width > width:
+            rendition = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        for extension in (get_fallback_extension(name), 'webp'):
+            image_format, options = RENDITION_FORMATS[extension]
+            rendition_name = get_rendition_name(name, width, extension)
+            storage.delete(rendition_name)
+            names.append(storage.save(rendition_name, ContentFile(encode_image(rendition, image_format, **options))))
+    return names
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_image_workers(), thread_name_prefix='images')
+    return _executor
+
+
+# Names of the images being generated renditions for
+_pending_names = set()
+
+def _get_renditions_cache_key(name):
+    return RENDITIONS_CACHE_KEY.format(hashlib.md5(name.encode('utf-8')).hexdigest())
+
+
+def _generate_renditions(storage, name):
+    try:
+        return generate_renditions(storage, name)
+    except Exception:
+        logger.exception('Failed to generate the renditions of %s', name)
+        # Do not try again on every request
+        cache.set(_get_renditions_cache_key(name), 'failed', 3600)
+    finally:
+        with _executor_lock:
+            _pending_names.discard(name)
+
+
+def generate_renditions_in_background(storage, name):
+    """Generate the renditions of an image in a worker thread, or right away if IMAGE_WORKERS is 0."""
+    with _executor_lock:
+        if name in _pending_names:
+            return
+        _pending_names.add(name)
+    if get_image_workers():
+        _get_executor().submit(_generate_renditions, storage, name)
+    else:
+        _generate_renditions(storage, name)
+
+
+def get_srcset(image, extension=None):
+    """srcset of the resized copies of an image (a FieldFile), empty until the copies are generated.
+
+       extension: 'webp', or None for the JPEG (or PNG) copies
+       Images uploaded before the copies existed get them generated in the background on first use.
+    """
+    if not image:
+        return ''
+    widths = get_rendition_widths()
+    if extension is None:
+        extension = get_fallback_extension(image.name)
+    cache_key = _get_renditions_cache_key(image.name)
+    status = cache.get(cache_key)
+    if status == 'failed':
+        return ''
+    if status != 'ready':
+        if not image.storage.exists(get_rendition_name(image.name, max(widths), 'webp')):
+            if image.storage.exists(image.name):
+                generate_renditions_in_background(image.storage, image.name)
+            else:
+                cache.set(cache_key, 'failed', 3600)
+            return ''
+        cache.set(cache_key, 'ready', None)
+    return ', '.join('{} {}w'.format(image.storage.url(get_rendition_name(image.name, width, extension)), width) for width in widths)
@@ -0,0 +1,143 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.test import Client
+
+from urllib.parse import urlsplit, parse_qs
+import hashlib
+import json
+import os
+
+from fbevents.models import Event
+from fbevents.utils import get_upcoming_events
+from website.compression import brotli, write_precompressed
+from website.datafiles import get_files_fingerprint
+from website.models import CommitteeRoleMember, Society, SocietyLink, Sponsor, SponsorLink
+from website.sitemaps import StaticViewSitemap, CommitteeSitemap, SocietySitemap, SponsorSitemap
+from website.views import PREVIOUS_COMMITTEE_FILE, FOOTBALL_POSITIONS_FILE
+
+MANIFEST_FILE_NAME = '.exportsite.json'
+
+
+def _get_model_fingerprint(model):
+    rows = model.objects.order_by('pk').values_list()
+    return hashlib.sha1(repr(list(rows)).encode('utf-8')).hexdigest()
+
+
+def _get_upcoming_events_fingerprint():
+    # Events on the homepage also change as time passes
+    return ','.join(str(pk) for pk in get_upcoming_events().values_list('pk', flat=True))
+
+
+def _get_fingerprint(dependency):
+    if isinstance(dependency, type):
+        return _get_model_fingerprint(dependency)
+    if isinstance(dependency, str):
+        return get_files_fingerprint((dependency,))
+    return dependency()
+
+
+# Models, data files (or functions returning a fingerprint) each page is rendered from,
+# pages of StaticViewSitemap not listed here only depend on their templates
+STATIC_VIEW_DEPENDENCIES = {
+    'home': (Sponsor, Event, _get_upcoming_events_fingerprint),
+    'committee-overview': (CommitteeRoleMember, PREVIOUS_COMMITTEE_FILE),
+    'football': (FOOTBALL_POSITIONS_FILE,),
+    'societies': (Society,),
+    'sponsors': (Sponsor,),
+}
+
+SITEMAP_DEPENDENCIES = [
+    (CommitteeSitemap, (CommitteeRoleMember,)),
+    (SocietySitemap, (Society, SocietyLink)),
+    (SponsorSitemap, (Sponsor, SponsorLink)),
+]
+
+
+def _get_file_name(url):
+    """Map a URL to a file, e.g. /sponsors/?sponsor=example to sponsors/example/index.html"""
+    url = urlsplit(url)
+    path = url.path.strip('/')
+    query = parse_qs(url.query)
+    if 'sponsor' in query:
+        path = os.path.join(path, query['sponsor'][0])
+    return os.path.join(path, 'index.html')
+
+
+class Command(BaseCommand):
+    """ python manage.py exportsite /path/to/output/ """
+
+    help = '''Render the pages in the sitemap to gzip and brotli pre-compressed HTML files, only re-rendering pages whose models changed.
+    Sponsor pages are written to sponsors/<codename>/index.html, rewrite /sponsors/?sponsor=<codename> to them when serving.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', type=str)
+        parser.add_argument('--force', action='store_true', help='Re-render every page, e.g. after templates changed')
+
+    def handle(self, *args, **options):
+        output_dir = options['output_dir']
+        os.makedirs(output_dir, exist_ok=True)
+        if brotli is None:
+            self.stderr.write('Install brotli to also write .br files.')
+
+        manifest_file_name = os.path.join(output_dir, MANIFEST_FILE_NAME)
+        manifest = {}
+        if os.path.exists(manifest_file_name) and not options['force']:
+            with open(manifest_file_name) as manifest_file:
+                manifest = json.load(manifest_file)
+
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        fingerprints = {}
+        new_manifest = {}
+        no_of_pages_rendered = 0
+        for url, dependencies in self._get_pages():
+            for dependency in dependencies:
+                if dependency not in fingerprints:
+                    fingerprints[dependency] = _get_fingerprint(dependency)
+            fingerprint = '-'.join(fingerprints[dependency] for dependency in dependencies)
+
+            file_name = os.path.join(output_dir, _get_file_name(url))
+            if manifest.get(url) == fingerprint and os.path.exists(file_name):
+                new_manifest[url] = fingerprint
+                continue
+
+            try:
+                response = client.get(url)
+            except Exception as e:
+                # Keep exporting the other pages
+                self.stderr.write('Skipped {}, got {!r}.'.format(url, e))
+                continue
+            if response.status_code != 200:
+                self.stderr.write('Skipped {}, got status {}.'.format(url, response.status_code))
+                continue
+            self._write(file_name, response.content)
+            new_manifest[url] = fingerprint
+            no_of_pages_rendered += 1
+
+        # Remove pages no longer in the sitemap
+        no_of_pages_removed = 0
+        for url in set(manifest) - set(new_manifest):
+            file_name = os.path.join(output_dir, _get_file_name(url))
+            for suffix in ('', '.gz', '.br'):
+                if os.path.exists(file_name + suffix):
+                    os.remove(file_name + suffix)
+            no_of_pages_removed += 1
+
+        with open(manifest_file_name, 'w') as manifest_file:
+            json.dump(new_manifest, manifest_file, indent=2, sort_keys=True)
+        self.stdout.write('Rendered {} page(s), {} unchanged, removed {}.'.format(no_of_pages_rendered, len(new_manifest) - no_of_pages_rendered, no_of_pages_removed))
+
+    def _get_pages(self):
+        """Yield the URL of each page in the sitemap and what it depends on."""
+        static_view_sitemap = StaticViewSitemap()
+        for item in static_view_sitemap.items():
+            yield static_view_sitemap.location(item), STATIC_VIEW_DEPENDENCIES.get(item, ())
+        for sitemap_class, dependencies in SITEMAP_DEPENDENCIES:
+            sitemap = sitemap_class()
+            for item in sitemap.items():
+                yield sitemap.location(item), dependencies
+
+    def _write(self, file_name, content):
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        with open(file_name, 'wb') as html_file:
+            html_file.write(content)
+        write_precompressed(file_name, content)
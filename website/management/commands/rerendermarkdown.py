@@ -0,0 +1,52 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from website.fields import RenderedMarkdownField
+
+
+def rerender_markdown(model, fields, missing_only=False, batch_size=500):
+    """Render the RenderedMarkdownFields of every row of a model again, returns the number of rows changed."""
+    queryset = model.objects.order_by('pk').only('pk', *[name for field in fields for name in (field.source_field, field.attname)])
+    no_of_rows_changed = 0
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        changed = False
+        for field in fields:
+            html = getattr(obj, field.attname)
+            if missing_only and html:
+                continue
+            new_html = field.render(obj)
+            if new_html != html:
+                setattr(obj, field.attname, new_html)
+                changed = True
+        if changed:
+            batch.append(obj)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                model.objects.bulk_update(batch, [field.attname for field in fields])
+            no_of_rows_changed += len(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            model.objects.bulk_update(batch, [field.attname for field in fields])
+        no_of_rows_changed += len(batch)
+    return no_of_rows_changed
+
+
+class Command(BaseCommand):
+    """ python manage.py rerendermarkdown """
+
+    help = 'Render the stored html of Markdown fields again, e.g. after the sanitising rules changed or to fill in html of existing rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', help='Only render html which is empty, e.g. right after adding the field')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            fields = [field for field in model._meta.get_fields() if isinstance(field, RenderedMarkdownField)]
+            if not fields:
+                continue
+            no_of_rows_changed = rerender_markdown(model, fields, missing_only=options['missing'], batch_size=options['batch_size'])
+            self.stdout.write('{}: {} row(s) updated.'.format(model._meta.label, no_of_rows_changed))
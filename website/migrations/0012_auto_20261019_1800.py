@@ -0,0 +1,30 @@
+# Generated by Django 2.2.5 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0011_auto_20190801_1337'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sponsor',
+            name='dark_logo',
+            field=models.ImageField(default='', upload_to=''),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='sponsor',
+            name='logo',
+            field=models.ImageField(default='', upload_to=''),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='sponsor',
+            name='level',
+            field=models.CharField(choices=[('gold', 'gold'), ('silver', 'silver'), ('bronze', 'bronze'), ('64-bit', '64-bit'), ('32-bit', '32-bit'), ('16-bit', '16-bit')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.5 on 2026-10-19 18:10
+
+from django.db import migrations
+import website.fields
+
+
+def render_markdown_fields(apps, schema_editor):
+    from website.rendering import render_markdown
+    CommitteeRoleMember = apps.get_model('website', 'CommitteeRoleMember')
+    Society = apps.get_model('website', 'Society')
+    for model, source_field, html_field in ((CommitteeRoleMember, 'member_manifesto', 'member_manifesto_html'), (Society, 'description', 'description_html')):
+        objects = list(model.objects.only('pk', source_field))
+        for obj in objects:
+            source = getattr(obj, source_field)
+            setattr(obj, html_field, render_markdown(source) if source else '')
+        model.objects.bulk_update(objects, [html_field], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0012_auto_20261019_1800'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='committeerolemember',
+            name='member_manifesto_html',
+            field=website.fields.RenderedMarkdownField(source_field='member_manifesto'),
+        ),
+        migrations.AddField(
+            model_name='society',
+            name='description_html',
+            field=website.fields.RenderedMarkdownField(source_field='description'),
+        ),
+        migrations.RunPython(render_markdown_fields, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,8 @@ from django.templatetags.static import static
 
 import os
 
+from .fields import RenderedMarkdownField
+
 
 # Committee
 
@@ -21,9 +23,12 @@ class CommitteeRoleMember(models.Model):
     member_nickname = models.CharField(max_length=50, blank=True)
     member_image = models.ImageField(upload_to=committee_member_image_file_name)
     member_manifesto = models.TextField()
+    member_manifesto_html = RenderedMarkdownField(source_field='member_manifesto')
     member_email = models.EmailField(max_length=100)
     member_facebook = models.URLField(blank=True)
 
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
     class Meta:
         verbose_name_plural = 'committee roles members'
 
@@ -45,6 +50,7 @@ class Society(models.Model):
     logo = models.ImageField(upload_to=society_logo_image_file_name)
 
     description = models.TextField(blank=True)
+    description_html = RenderedMarkdownField(source_field='description')
 
     time = models.CharField(max_length=100, blank=True)
     location = models.CharField(max_length=100, blank=True)
@@ -58,6 +64,8 @@ class Society(models.Model):
     youtube = models.URLField(blank=True, verbose_name='YouTube URL')
     github = models.CharField(max_length=100, blank=True, verbose_name='GitHub username/orgnisation')
 
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
     class Meta:
         verbose_name_plural = 'societies'
 
@@ -80,9 +88,12 @@ class SocietyLink(models.Model):
 # Sponsors
 
 class Sponsor(models.Model):
+    # Highest level first
+    LEVELS = [('gold', 'gold'), ('silver', 'silver'), ('bronze', 'bronze'), ('64-bit', '64-bit'), ('32-bit', '32-bit'), ('16-bit', '16-bit')]
+
     codename = models.CharField(max_length=50, primary_key=True)
     name = models.CharField(max_length=100)
-    level = models.CharField(choices=[('gold', 'gold'), ('silver', 'silver'), ('bronze', 'bronze'), ('64-bit', '64-bit'), ('32-bit', '32-bit'), ('16-bit', '16-bit')], max_length=20)
+    level = models.CharField(choices=LEVELS, max_length=20)
     logo_file = models.CharField(max_length=100) # Redundant as logo and dark_logo now exist
 
     logo = models.ImageField()
@@ -91,6 +102,8 @@ class Sponsor(models.Model):
     description = models.TextField()
     website = models.URLField()
 
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
     def __str__(self):
         return self.name
     
@@ -116,3 +129,15 @@ class SponsorLink(models.Model):
 
     def __str__(self):
         return '{} - {}'.format(self.sponsor, self.name)
+
+
+# Caching
+
+class Version(models.Model):
+    """Version of the data of a scope, e.g. an app, bumped whenever the data changes, see caching.get_version."""
+    scope = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField()
+    modified = models.DateTimeField()
+
+    def __str__(self):
+        return '{} {}'.format(self.scope, self.version)
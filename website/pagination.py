@@ -0,0 +1,84 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from collections.abc import Sequence
+from functools import reduce
+import operator
+
+
+CURSOR_SEPARATOR = '_'
+
+
+def encode_cursor(obj, fields):
+    """Build a cursor from the values of the ordering fields of an object."""
+    values = []
+    for field in fields:
+        value = getattr(obj, field)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+    return CURSOR_SEPARATOR.join(values)
+
+
+def _seek_filter(fields, values, lookup):
+    """(f1, f2, ...) < (v1, v2, ...) as a filter, or > with lookup 'gt'."""
+    conditions = []
+    for i, field in enumerate(fields):
+        condition = {fields[j]: values[j] for j in range(i)}
+        condition['{}__{}'.format(field, lookup)] = values[i]
+        conditions.append(Q(**condition))
+    return reduce(operator.or_, conditions)
+
+
+class KeysetPage(Sequence):
+
+    def __init__(self, object_list, fields, has_next, has_previous):
+        self.object_list = object_list
+        self.fields = fields
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def next_cursor(self):
+        return encode_cursor(self.object_list[-1], self.fields) if self.object_list else ''
+
+    def previous_cursor(self):
+        return encode_cursor(self.object_list[0], self.fields) if self.object_list else ''
+
+
+def keyset_paginate(queryset, fields, per_page, before=None, after=None):
+    """Get a page of the queryset ordered by the fields descending, the last field must be unique.
+
+       before: cursor of the last object on the previous (newer) page, to get the next (older) page
+       after: cursor of the first object on the next (older) page, to get the previous (newer) page
+       Only one page of rows is fetched, so the cost does not grow with how deep the page is.
+    """
+    cursor = after or before
+    values = cursor.rsplit(CURSOR_SEPARATOR, len(fields) - 1) if cursor else None
+    if values is not None and len(values) != len(fields):
+        values = None
+
+    try:
+        if values is not None and after:
+            objects = list(queryset.filter(_seek_filter(fields, values, 'gt')).order_by(*fields)[:per_page + 1])
+            if len(objects) <= per_page:
+                # Reached the newest objects, show a full first page instead
+                return keyset_paginate(queryset, fields, per_page)
+            return KeysetPage(objects[:per_page][::-1], fields, True, True)
+
+        if values is not None:
+            queryset = queryset.filter(_seek_filter(fields, values, 'lt'))
+        objects = list(queryset.order_by(*['-{}'.format(field) for field in fields])[:per_page + 1])
+    except (ValidationError, ValueError):
+        # Invalid cursor, start from the first page
+        return keyset_paginate(queryset, fields, per_page)
+    return KeysetPage(objects[:per_page], fields, len(objects) > per_page, values is not None)
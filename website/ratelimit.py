@@ -0,0 +1,98 @@
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+import math
+
+
+class DatabaseBackend:
+    """Store each hit as a row of a model with a key field and a time field.
+
+    The model should have a composite index on (key field, time field) so counting is a single indexed COUNT,
+    and an index on the time field for clear_expired.
+    """
+
+    def __init__(self, model, key_field='key', time_field='time'):
+        self.model = model
+        self.key_field = key_field
+        self.time_field = time_field
+
+    def count(self, scope, keys, window):
+        return self.model.objects.filter(**{
+            '{}__in'.format(self.key_field): keys,
+            '{}__gte'.format(self.time_field): timezone.now() - window,
+        }).count()
+
+    def hit(self, scope, key, window):
+        self.model.objects.create(**{self.key_field: key})
+
+    def clear_expired(self, window, batch_size=500):
+        """Delete expired hits batch by batch, returns the number of hits deleted."""
+        before = timezone.now() - window
+        no_of_hits_cleared = 0
+        while True:
+            with transaction.atomic():
+                pks = list(self.model.objects.filter(**{'{}__lt'.format(self.time_field): before}).values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                self.model.objects.filter(pk__in=pks).delete()
+            no_of_hits_cleared += len(pks)
+        return no_of_hits_cleared
+
+
+class CacheBackend:
+    """Count hits in the Django cache, the window is split into buckets which expire on their own."""
+
+    def __init__(self, cache_alias='default', buckets=24):
+        self.cache_alias = cache_alias
+        self.buckets = buckets
+
+    def _bucket_seconds(self, window):
+        return math.ceil(window.total_seconds() / self.buckets)
+
+    def _bucket_key(self, scope, key, bucket):
+        return 'ratelimit:{}:{}:{}'.format(scope, key, bucket)
+
+    def count(self, scope, keys, window):
+        bucket_seconds = self._bucket_seconds(window)
+        current_bucket = int(timezone.now().timestamp()) // bucket_seconds
+        bucket_keys = [self._bucket_key(scope, key, bucket) for key in keys for bucket in range(current_bucket - self.buckets + 1, current_bucket + 1)]
+        return sum(caches[self.cache_alias].get_many(bucket_keys).values())
+
+    def hit(self, scope, key, window):
+        cache = caches[self.cache_alias]
+        bucket_seconds = self._bucket_seconds(window)
+        bucket_key = self._bucket_key(scope, key, int(timezone.now().timestamp()) // bucket_seconds)
+        # Keep the bucket for the whole window after it is closed
+        cache.add(bucket_key, 0, timeout=bucket_seconds * (self.buckets + 1))
+        try:
+            cache.incr(bucket_key)
+        except ValueError:
+            # Expired between add and incr
+            cache.set(bucket_key, 1, timeout=bucket_seconds * (self.buckets + 1))
+
+    def clear_expired(self, window, batch_size=500):
+        # Buckets expire by the cache timeout
+        return 0
+
+
+class RateLimiter:
+    """Allow a key at most limit hits within a sliding window (a timedelta)."""
+
+    def __init__(self, scope, limit, window, backend):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.backend = backend
+
+    def is_allowed(self, keys):
+        """Check if the keys together have not reached the limit.
+           A list of keys allows one client to be identified by more than one key, e.g. during a change of hashing.
+        """
+        return self.backend.count(self.scope, keys, self.window) < self.limit
+
+    def hit(self, key):
+        self.backend.hit(self.scope, key, self.window)
+
+    def clear_expired(self, batch_size=500):
+        return self.backend.clear_expired(self.window, batch_size)
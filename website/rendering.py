@@ -0,0 +1,47 @@
+from functools import lru_cache, partial
+import threading
+
+import markdown
+from bleach import Cleaner
+from bleach.linkifier import LinkifyFilter
+
+
+MARKDOWN_ALLOWED_TAGS = ['a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 'strong', 'ul', 'p']
+
+# Number of rendered texts kept in memory
+RENDER_CACHE_SIZE = 1024
+
+
+# Markdown and Cleaner instances keep state while converting, so each thread has its own
+_local = threading.local()
+
+
+def _get_markdown():
+    if not hasattr(_local, 'markdown'):
+        _local.markdown = markdown.Markdown()
+    return _local.markdown
+
+
+def _get_cleaner(linkify):
+    cleaners = getattr(_local, 'cleaners', None)
+    if cleaners is None:
+        cleaners = _local.cleaners = {
+            True: Cleaner(tags=MARKDOWN_ALLOWED_TAGS, filters=[partial(LinkifyFilter, parse_email=True)]),
+            False: Cleaner(tags=MARKDOWN_ALLOWED_TAGS),
+        }
+    return cleaners[linkify]
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_markdown(text, linkify):
+    html = _get_markdown().reset().convert(text)
+    return _get_cleaner(linkify).clean(html)
+
+
+def render_markdown(text, linkify=True):
+    """Transform Markdown into sanitised html, not allowed html tags are escaped.
+
+       linkify: convert URLs and email addresses into links
+       Rendered html is cached by the text, so rendering unchanged text again is a dictionary lookup.
+    """
+    return _render_markdown(str(text), bool(linkify))
@@ -0,0 +1,89 @@
+from django.apps import apps
+from django.contrib.auth.models import User, Group
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import CommitteeRoleMember, Society, SocietyLink, Sponsor, SponsorLink
+from .caching import bump_content_version, bump_version, bump_user_auth_version
+from .images import generate_renditions_in_background
+
+
+@receiver(post_save, sender=CommitteeRoleMember)
+@receiver(post_delete, sender=CommitteeRoleMember)
+@receiver(post_save, sender=Society)
+@receiver(post_delete, sender=Society)
+@receiver(post_save, sender=SocietyLink)
+@receiver(post_delete, sender=SocietyLink)
+@receiver(post_save, sender=Sponsor)
+@receiver(post_delete, sender=Sponsor)
+@receiver(post_save, sender=SponsorLink)
+@receiver(post_delete, sender=SponsorLink)
+def invalidate_content(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(post_save, sender=SocietyLink)
+@receiver(post_delete, sender=SocietyLink)
+def touch_society(sender, instance, **kwargs):
+    # Links are shown on the society page, so they change its lastmod in the sitemap
+    Society.objects.filter(pk=instance.society_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=SponsorLink)
+@receiver(post_delete, sender=SponsorLink)
+def touch_sponsor(sender, instance, **kwargs):
+    Sponsor.objects.filter(pk=instance.sponsor_id).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_auth(sender, instance, action, reverse, pk_set, **kwargs):
+    # Pages show different things to committee members and users with permissions, see conditional.versions_condition
+    if action not in ('post_add', 'post_remove', 'post_clear') or (action != 'post_clear' and not pk_set):
+        return
+    if not reverse:
+        bump_user_auth_version(instance.pk)
+    elif action == 'post_clear':
+        # The users of the group or permission are not known any more
+        bump_version('auth')
+    else:
+        for user_pk in pk_set:
+            bump_user_auth_version(user_pk)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_auth(sender, action, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and (action == 'post_clear' or pk_set):
+        bump_version('auth')
+
+
+# Names of the ImageFields of each model
+_image_fields = {}
+
+def _get_image_fields(model):
+    if model not in _image_fields:
+        _image_fields[model] = [field.attname for field in model._meta.concrete_fields if isinstance(field, models.ImageField)]
+    return _image_fields[model]
+
+
+def find_uploaded_images(sender, instance, raw=False, **kwargs):
+    # Files not committed yet are saved to the storage by this save
+    if not raw:
+        instance._uploaded_image_fields = [name for name in _get_image_fields(sender) if getattr(instance, name) and not getattr(instance, name)._committed]
+
+
+def generate_uploaded_image_renditions(sender, instance, raw=False, **kwargs):
+    for name in getattr(instance, '_uploaded_image_fields', ()):
+        image = getattr(instance, name)
+        transaction.on_commit(lambda storage=image.storage, image_name=image.name: generate_renditions_in_background(storage, image_name))
+    instance._uploaded_image_fields = []
+
+
+def connect_image_receivers():
+    """Generate the renditions of images uploaded to any model with ImageFields, see WebsiteConfig.ready."""
+    for model in apps.get_models():
+        if _get_image_fields(model):
+            pre_save.connect(find_uploaded_images, sender=model)
+            post_save.connect(generate_uploaded_image_renditions, sender=model)
@@ -7,7 +7,10 @@ class CommitteeSitemap(Sitemap):
     changefreq = 'yearly'
 
     def items(self):
-        return CommitteeRoleMember.objects.all()
+        return CommitteeRoleMember.objects.only('role_codename', 'updated_at').order_by('pk')
+
+    def lastmod(self, item):
+        return item.updated_at
 
     def location(self, item):
         return reverse('website:committee-member', kwargs={'role': item.role_codename})
@@ -17,7 +20,10 @@ class SocietySitemap(Sitemap):
     changefreq = 'yearly'
 
     def items(self):
-        return Society.objects.all()
+        return Society.objects.only('codename', 'updated_at').order_by('pk')
+
+    def lastmod(self, item):
+        return item.updated_at
 
     def location(self, item):
         return reverse('website:societies-details', kwargs={'society': item.codename})
@@ -27,7 +33,10 @@ class SponsorSitemap(Sitemap):
     changefreq = 'monthly'
 
     def items(self):
-        return Sponsor.objects.all()
+        return Sponsor.objects.only('codename', 'updated_at').order_by('pk')
+
+    def lastmod(self, item):
+        return item.updated_at
 
     def location(self, item):
         return '{}?sponsor={}'.format(reverse('website:sponsors'), item.codename)
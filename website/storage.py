@@ -0,0 +1,117 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image, features
+
+from .compression import write_precompressed
+
+
+logger = logging.getLogger(__name__)
+
+
+# Text files written with .gz and .br copies
+PRECOMPRESSED_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml')
+
+
+def _is_avif_available():
+    try:
+        return features.check('avif')
+    except ValueError:
+        return False
+
+
+def _replace_if_smaller(file_name, content):
+    if len(content) < os.path.getsize(file_name):
+        with open(file_name, 'wb') as f:
+            f.write(content)
+
+
+def _encode(image, image_format, **options):
+    with tempfile.SpooledTemporaryFile() as f:
+        image.save(f, image_format, **options)
+        f.seek(0)
+        return f.read()
+
+
+def optimise_png(file_name):
+    """Recompress a PNG losslessly."""
+    with Image.open(file_name) as image:
+        options = {key: image.info[key] for key in ('transparency', 'gamma', 'dpi') if key in image.info}
+        _replace_if_smaller(file_name, _encode(image, 'PNG', optimize=True, **options))
+
+
+def optimise_jpeg(file_name):
+    """Recompress a JPEG losslessly with jpegtran, Pillow can only re-encode JPEGs lossily."""
+    jpegtran = shutil.which('jpegtran')
+    if jpegtran is None:
+        return
+    result = subprocess.run([jpegtran, '-copy', 'none', '-optimize', '-progressive', file_name], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if result.returncode == 0 and result.stdout:
+        _replace_if_smaller(file_name, result.stdout)
+
+
+def write_image_siblings(file_name):
+    """Write WebP (and AVIF if Pillow supports it) copies next to an image, e.g. logo.png.webp, when they are smaller."""
+    with Image.open(file_name) as image:
+        image.load()
+    lossless = image.format == 'PNG'
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+    size = os.path.getsize(file_name)
+    siblings = [('.webp', 'WEBP', {'lossless': True} if lossless else {'quality': 85})]
+    if _is_avif_available():
+        siblings.append(('.avif', 'AVIF', {'quality': 90} if lossless else {'quality': 60}))
+    for extension, image_format, options in siblings:
+        content = _encode(image, image_format, **options)
+        if len(content) < size:
+            with open(file_name + extension, 'wb') as f:
+                f.write(content)
+
+
+class OptimisedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Static files with content hashes in their names, so they can be cached forever.
+
+       After collectstatic hashes the files, the hashed PNGs and JPEGs are recompressed losslessly and get WebP/AVIF copies,
+       and text files get .gz/.br copies. Hashed names never change content, so files processed before are skipped.
+       Before collectstatic has run (no manifest or no STATIC_ROOT), e.g. in development, the unhashed names are used.
+    """
+
+    def read_manifest(self):
+        if not self.location:
+            # STATIC_ROOT not set, e.g. in development
+            return None
+        return super().read_manifest()
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            try:
+                self._optimise(self.path(hashed_name))
+            except Exception:
+                logger.exception('Failed to optimise %s', hashed_name)
+
+    def _optimise(self, file_name):
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in PRECOMPRESSED_EXTENSIONS:
+            if not os.path.exists(file_name + '.gz'):
+                with open(file_name, 'rb') as f:
+                    write_precompressed(file_name, f.read())
+        elif extension in ('.png', '.jpg', '.jpeg'):
+            if not os.path.exists(file_name + '.webp'):
+                if extension == '.png':
+                    optimise_png(file_name)
+                else:
+                    optimise_jpeg(file_name)
+                write_image_siblings(file_name)
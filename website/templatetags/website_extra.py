@@ -1,12 +1,8 @@
 from django import template
 import random
-import markdown
-from bleach import Cleaner
-from bleach.linkifier import LinkifyFilter
-from functools import partial
 
-
-markdown_allowed_tags = ['a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 'strong', 'ul', 'p']
+from website.rendering import render_markdown
+from website.images import get_srcset
 
 
 register = template.Library()
@@ -30,8 +26,7 @@ def md(s):
     """Transform Markdown into html.
        Not allowed html tags will be escaped.
     """
-    cleaner = Cleaner(tags=markdown_allowed_tags, filters=[partial(LinkifyFilter, parse_email=True)])
-    return cleaner.clean(markdown.markdown(s))
+    return render_markdown(s)
 
 
 @register.filter
@@ -39,8 +34,18 @@ def md_nourl(s):
     """Transform Markdown into html. URLs and email addresses are not converted into links automatically.
        Not allowed html tags will be escaped.
     """
-    cleaner = Cleaner(tags=markdown_allowed_tags)
-    return cleaner.clean(markdown.markdown(s))
+    return render_markdown(s, linkify=False)
+
+
+@register.simple_tag
+def image_srcset(image, extension=None):
+    """srcset of the resized copies of an ImageField, e.g.
+       <picture>
+         <source type="image/webp" srcset="{% image_srcset photo 'webp' %}" sizes="20rem">
+         <img src="{{ photo.url }}" srcset="{% image_srcset photo %}" sizes="20rem">
+       </picture>
+    """
+    return get_srcset(image, extension)
 
 
 @register.simple_tag(takes_context=True)
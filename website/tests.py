@@ -1,3 +1,507 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
+from django.db.models.signals import pre_save
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import yaml
+from PIL import Image
+
+from django.contrib.auth.models import User, Group
+
+from feedback.models import SubmittedIpRecord, Feedback, Category
+
+from .models import Society, Sponsor, SponsorLink, Version
+
+from .ratelimit import RateLimiter, DatabaseBackend, CacheBackend
+from .pagination import keyset_paginate
+from .caching import get_content_version, get_version
+from .datafiles import load_data_file
+from .templatetags.website_extra import md, md_nourl, image_srcset
+from .utils import clean_image
+from .storage import OptimisedManifestStaticFilesStorage
+
+
+class RateLimiterTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_database_backend(self):
+        limiter = RateLimiter('test', 2, timedelta(hours=24), DatabaseBackend(SubmittedIpRecord, key_field='ip_hash'))
+        self.assertTrue(limiter.is_allowed(['key01']))
+        limiter.hit('key01')
+        limiter.hit('key01')
+        self.assertFalse(limiter.is_allowed(['key01']))
+        self.assertFalse(limiter.is_allowed(['key01', 'key02']))
+        self.assertTrue(limiter.is_allowed(['key02']))
+
+        # Test hits out of the window are not counted and cleared in batches
+        SubmittedIpRecord.objects.update(time=timezone.now() - timedelta(hours=25))
+        limiter.hit('key01')
+        self.assertTrue(limiter.is_allowed(['key01']))
+        self.assertEqual(limiter.clear_expired(batch_size=1), 2)
+        self.assertEqual(SubmittedIpRecord.objects.count(), 1)
+
+    def test_cache_backend(self):
+        limiter = RateLimiter('test', 2, timedelta(hours=24), CacheBackend())
+        self.assertTrue(limiter.is_allowed(['key01']))
+        limiter.hit('key01')
+        self.assertTrue(limiter.is_allowed(['key01']))
+        limiter.hit('key01')
+        self.assertFalse(limiter.is_allowed(['key01']))
+        self.assertTrue(limiter.is_allowed(['key02']))
+        limiter.hit('key02')
+        limiter.hit('key03')
+        self.assertTrue(limiter.is_allowed(['key02']))
+        self.assertFalse(limiter.is_allowed(['key02', 'key03']))
+
+
+class KeysetPaginateTestCase(TestCase):
+
+    def setUp(self):
+        category_others = Category.objects.create(name='Others')
+        for i in range(25):
+            Feedback.objects.create(message='Feedback {:02}'.format(i), category=category_others)
+        # Feedback on an earlier day
+        Feedback.objects.filter(message='Feedback 00').update(time=timezone.now().date() - timedelta(days=1))
+
+    def _messages(self, page):
+        return [feedback.message for feedback in page]
+
+    def test_keyset_paginate(self):
+        feedbacks = Feedback.objects.all()
+
+        # Test first page
+        page01 = keyset_paginate(feedbacks, ('time', 'id'), 10)
+        self.assertEqual(self._messages(page01), ['Feedback {:02}'.format(i) for i in range(24, 14, -1)])
+        self.assertFalse(page01.has_previous())
+        self.assertTrue(page01.has_next())
+
+        # Test following pages, ordered by time then id
+        page02 = keyset_paginate(feedbacks, ('time', 'id'), 10, before=page01.next_cursor())
+        self.assertEqual(self._messages(page02), ['Feedback {:02}'.format(i) for i in range(14, 4, -1)])
+        page03 = keyset_paginate(feedbacks, ('time', 'id'), 10, before=page02.next_cursor())
+        self.assertEqual(self._messages(page03), ['Feedback {:02}'.format(i) for i in [4, 3, 2, 1, 0]])
+        self.assertTrue(page03.has_previous())
+        self.assertFalse(page03.has_next())
+
+        # Test going back
+        self.assertEqual(self._messages(keyset_paginate(feedbacks, ('time', 'id'), 10, after=page03.previous_cursor())), self._messages(page02))
+        self.assertEqual(self._messages(keyset_paginate(feedbacks, ('time', 'id'), 10, after=page02.previous_cursor())), self._messages(page01))
+
+        # Test invalid cursor
+        self.assertEqual(self._messages(keyset_paginate(feedbacks, ('time', 'id'), 10, before='invalid_cursor')), self._messages(page01))
+        self.assertEqual(self._messages(keyset_paginate(feedbacks, ('time', 'id'), 10, before='invalid')), self._messages(page01))
+
+
+class PageCacheTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_public_page(self):
+        response = self.client.get('/about/')
+        self.assertTemplateUsed(response, 'website/about.html')
+
+        # Test served from cache without rendering
+        response = self.client.get('/about/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.templates, [])
+
+        # Test not cached for authenticated users
+        self.client.force_login(User.objects.create(username='test01'))
+        self.assertTemplateUsed(self.client.get('/about/'), 'website/about.html')
+
+    def test_invalidate_on_save(self):
+        self.client.get('/societies/')
+        content_version = get_content_version()
+        Society.objects.create(codename='sucss', short_name='SUCSS', name='Southampton University Computer Science Society', logo='societies/sucss.png')
+        self.assertNotEqual(get_content_version(), content_version)
+        response = self.client.get('/societies/')
+        self.assertTemplateUsed(response, 'website/societies/societies.html')
+        self.assertContains(response, 'Southampton University Computer Science Society')
+
+    def test_invalidate_from_other_process(self):
+        self.client.get('/about/')
+        # Test bumps of other processes, e.g. cron jobs, are seen through the database
+        Version.objects.filter(scope='content').update(version=F('version') + 1)
+        self.assertTemplateUsed(self.client.get('/about/'), 'website/about.html')
+
+    def test_query_string(self):
+        self.client.get('/about/')
+        # Test other query parameters are not cached separately
+        self.assertEqual(self.client.get('/about/?utm_source=test').templates, [])
+
+    def test_data_files(self):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        os.makedirs(os.path.join(base_dir, 'website', 'data'))
+        file_name = os.path.join(base_dir, 'website', 'data', 'football-positions.yaml')
+        with open(file_name, 'w') as data_file:
+            data_file.write('positions: []\n')
+
+        with override_settings(BASE_DIR=base_dir):
+            self.client.get('/sports/football/')
+            self.assertEqual(self.client.get('/sports/football/').templates, [])
+
+            # Test rendered again after the data file is modified
+            os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns + 10 ** 9))
+            self.assertTemplateUsed(self.client.get('/sports/football/'), 'website/sports/football.html')
+
+
+class SponsorsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for codename, level in (('bronze01', 'bronze'), ('gold01', 'gold'), ('gold02', 'gold'), ('silver01', 'silver')):
+            Sponsor.objects.create(codename=codename, name=codename, level=level, logo='sponsors/{}.png'.format(codename), dark_logo='sponsors/{}.png'.format(codename), description='', website='https://example.com/')
+        SponsorLink.objects.create(sponsor_id='gold01', name='Careers', url='https://example.com/careers')
+
+    def test_sponsors(self):
+        # Versions are created when first read
+        get_version('auth')
+        with self.assertNumQueries(3):
+            response = self.client.get('/sponsors/')
+        self.assertEqual([sponsor.codename for sponsor in response.context['gold_sponsors']], ['gold01', 'gold02'])
+        self.assertEqual([sponsor.codename for sponsor in response.context['bronze_sponsors']], ['bronze01'])
+
+        # Test the grouped sponsors and their links are cached, only the versions are read
+        with self.assertNumQueries(1):
+            response = self.client.get('/sponsors/?sponsor=gold01')
+        self.assertContains(response, 'https://example.com/careers')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/sponsors/?sponsor=none').status_code, 404)
+
+        # Test invalidated on save
+        SponsorLink.objects.create(sponsor_id='silver01', name='Internships', url='https://example.com/internships')
+        self.assertContains(self.client.get('/sponsors/?sponsor=silver01'), 'https://example.com/internships')
+
+
+class DataFileTestCase(TestCase):
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir)
+        self.file_name = os.path.join(self.base_dir, 'positions.yaml')
+        with open(self.file_name, 'w') as data_file:
+            data_file.write('- goalkeeper\n')
+
+    def test_load_data_file(self):
+        with override_settings(BASE_DIR=self.base_dir):
+            positions = load_data_file('positions.yaml')
+            self.assertEqual(positions, ['goalkeeper'])
+            # Test parsed once
+            self.assertIs(load_data_file('positions.yaml'), positions)
+
+            # Test parsed again after the file is modified
+            with open(self.file_name, 'w') as data_file:
+                data_file.write('- goalkeeper\n- defender\n')
+            os.utime(self.file_name, ns=(0, os.stat(self.file_name).st_mtime_ns + 10 ** 9))
+            self.assertEqual(load_data_file('positions.yaml'), ['goalkeeper', 'defender'])
+
+            with self.assertRaises(OSError):
+                load_data_file('none.yaml')
+
+            # Test no arbitrary Python objects
+            with open(self.file_name, 'w') as data_file:
+                data_file.write('!!python/object/apply:os.getcwd []\n')
+            os.utime(self.file_name, ns=(0, os.stat(self.file_name).st_mtime_ns + 2 * 10 ** 9))
+            with self.assertRaises(yaml.YAMLError):
+                load_data_file('positions.yaml')
+
+
+class MarkdownTestCase(TestCase):
+
+    def test_md(self):
+        self.assertEqual(md('**Hello** https://example.com'), '<p><strong>Hello</strong> <a href="https://example.com" rel="nofollow">https://example.com</a></p>')
+        self.assertEqual(md_nourl('**Hello** https://example.com'), '<p><strong>Hello</strong> https://example.com</p>')
+        self.assertEqual(md('<script>alert(1)</script>'), '&lt;script&gt;alert(1)&lt;/script&gt;')
+        # Test rendering the same text again does not keep state from the previous render
+        self.assertEqual(md('[link][1]\n\n[1]: https://example.com'), '<p><a href="https://example.com" rel="nofollow">link</a></p>')
+        self.assertEqual(md('[link][1]'), '<p>[link][1]</p>')
+
+
+class RenderedMarkdownFieldTestCase(TestCase):
+
+    def test_render_on_save(self):
+        society = Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo='societies/sucss.png', description='**Hello** <script>')
+        self.assertEqual(Society.objects.get(pk='sucss').description_html, '<p><strong>Hello</strong> &lt;script&gt;</p>')
+        society.description = ''
+        society.save()
+        self.assertEqual(Society.objects.get(pk='sucss').description_html, '')
+
+    def test_rerender_markdown(self):
+        Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo='societies/sucss.png', description='**Hello**')
+        Society.objects.update(description_html='')
+        call_command('rerendermarkdown', '--missing', stdout=io.StringIO())
+        self.assertEqual(Society.objects.get(pk='sucss').description_html, '<p><strong>Hello</strong></p>')
+
+        # Test html not rendered again with --missing
+        Society.objects.update(description_html='<p>Stale</p>')
+        call_command('rerendermarkdown', '--missing', stdout=io.StringIO())
+        self.assertEqual(Society.objects.get(pk='sucss').description_html, '<p>Stale</p>')
+        call_command('rerendermarkdown', stdout=io.StringIO())
+        self.assertEqual(Society.objects.get(pk='sucss').description_html, '<p><strong>Hello</strong></p>')
+
+
+def _get_jpeg(width, height, orientation=None):
+    image = Image.new('RGB', (width, height), 'red')
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    image_io = io.BytesIO()
+    image.save(image_io, 'JPEG', exif=exif)
+    return image_io.getvalue()
+
+
+class CleanImageTestCase(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_clean_image(self):
+        # Test rotated according to EXIF orientation, scaled down and EXIF stripped
+        image_file = clean_image(SimpleUploadedFile('photo.jpg', _get_jpeg(3000, 1500, orientation=6)), max_dimension=1000)
+        with Image.open(image_file) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (500, 1000))
+            self.assertNotIn(0x0112, image.getexif())
+
+        image_file = clean_image(SimpleUploadedFile('photo.jpg', _get_jpeg(300, 200)), max_dimension=1000)
+        with Image.open(image_file) as image:
+            self.assertEqual(image.size, (300, 200))
+
+    @override_settings(IMAGE_WORKERS=0, IMAGE_RENDITION_WIDTHS=(100, 400))
+    def test_generate_renditions_on_upload(self):
+        with override_settings(MEDIA_ROOT=self.media_root), self.captureOnCommitCallbacks(execute=True):
+            Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo=SimpleUploadedFile('logo.jpg', _get_jpeg(300, 200)))
+        with Image.open(os.path.join(self.media_root, 'renditions', 'societies', 'sucss-100.webp')) as rendition:
+            self.assertEqual(rendition.size, (100, 67))
+        with Image.open(os.path.join(self.media_root, 'renditions', 'societies', 'sucss-400.jpg')) as rendition:
+            self.assertEqual(rendition.size, (300, 200))
+
+    def test_image_receivers(self):
+        # Test only connected to models with ImageFields
+        self.assertTrue(pre_save.has_listeners(Society))
+        self.assertFalse(pre_save.has_listeners(Feedback))
+        self.assertFalse(hasattr(Feedback.objects.create(message='Feedback', category=Category.objects.create(name='Others')), '_uploaded_image_fields'))
+
+    @override_settings(IMAGE_WORKERS=0, IMAGE_RENDITION_WIDTHS=(100, 400))
+    def test_image_srcset(self):
+        cache.clear()
+        with override_settings(MEDIA_ROOT=self.media_root, MEDIA_URL='/media/'):
+            # Test generated on first use for images uploaded before
+            os.makedirs(os.path.join(self.media_root, 'societies'))
+            with open(os.path.join(self.media_root, 'societies', 'sucss.png'), 'wb') as image_file:
+                Image.new('RGBA', (300, 200)).save(image_file, 'PNG')
+            society = Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo='societies/sucss.png')
+            self.assertEqual(image_srcset(society.logo), '')
+            self.assertEqual(image_srcset(society.logo), '/media/renditions/societies/sucss-100.png 100w, /media/renditions/societies/sucss-400.png 400w')
+            self.assertEqual(image_srcset(society.logo, 'webp'), '/media/renditions/societies/sucss-100.webp 100w, /media/renditions/societies/sucss-400.webp 400w')
+            with Image.open(os.path.join(self.media_root, 'renditions', 'societies', 'sucss-100.png')) as rendition:
+                self.assertEqual(rendition.mode, 'RGBA')
+
+
+class StaticFilesStorageTestCase(TestCase):
+
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+
+    def test_post_process(self):
+        storage = OptimisedManifestStaticFilesStorage(location=self.static_root, base_url='/static/')
+        # Test unhashed names used before collectstatic
+        self.assertEqual(storage.url('styles/base.css'), '/static/styles/base.css')
+
+        image_io = io.BytesIO()
+        Image.new('RGB', (100, 100), 'red').save(image_io, 'PNG')
+        storage.save('images/logo.png', ContentFile(image_io.getvalue()))
+        storage.save('styles/base.css', ContentFile(b'body { background: url("../images/logo.png"); }' * 10))
+        paths = {path: (storage, path) for path in ('images/logo.png', 'styles/base.css')}
+        list(storage.post_process(paths))
+
+        hashed_css = storage.stored_name('styles/base.css')
+        self.assertNotEqual(hashed_css, 'styles/base.css')
+        with gzip.open(storage.path(hashed_css + '.gz')) as gz_file, storage.open(hashed_css) as css_file:
+            self.assertEqual(gz_file.read(), css_file.read())
+        with Image.open(storage.path(storage.stored_name('images/logo.png') + '.webp')) as image:
+            self.assertEqual(image.format, 'WEBP')
+
+
+class NavigationTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for codename in ('sucss', 'ecsgaming'):
+            Society.objects.create(codename=codename, short_name=codename, name=codename, logo='societies/{}.png'.format(codename))
+
+    def test_societies_navigation(self):
+        self.client.get('/societies/')
+        # Test the detail pages reuse the cached societies and their links, only the versions are read
+        with self.assertNumQueries(1):
+            response = self.client.get('/societies/sucss/')
+        self.assertEqual(response.context['society'].codename, 'sucss')
+        self.assertCountEqual([society.codename for society in response.context['societies']], ['ecsgaming', 'sucss'])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/societies/none/').status_code, 404)
+
+
+class SitemapTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sitemap(self):
+        society = Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo='societies/sucss.png')
+        response = self.client.get('/sitemap.xml')
+        self.assertContains(response, '/societies/sucss/')
+        self.assertContains(response, '<lastmod>{}</lastmod>'.format(society.updated_at.date().isoformat()))
+
+        # Test not modified for crawlers with the current sitemap
+        self.assertEqual(self.client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        with self.assertNumQueries(1):
+            response = self.client.get('/sitemap.xml', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # Test changed when a society link changes
+        society.societylink_set.create(name='Website', url='https://example.com/')
+        self.assertEqual(self.client.get('/sitemap.xml', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+
+class ConditionalGetTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_public_page(self):
+        response = self.client.get('/societies/')
+        self.assertEqual(response.status_code, 200)
+
+        # Test not modified without rendering, only the versions are read
+        with self.assertNumQueries(1):
+            response = self.client.get('/societies/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # Test modified when the content changes
+        Society.objects.create(codename='sucss', short_name='SUCSS', name='SUCSS', logo='societies/sucss.png')
+        self.assertEqual(self.client.get('/societies/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+        # Test modified when another process changes the content
+        Version.objects.filter(scope='content').update(version=F('version') + 1)
+        self.assertEqual(self.client.get('/societies/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_data_files(self):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        os.makedirs(os.path.join(base_dir, 'website', 'data'))
+        file_name = os.path.join(base_dir, 'website', 'data', 'previous-committee.yaml')
+        with open(file_name, 'w') as data_file:
+            data_file.write('committees: []\n')
+
+        with override_settings(BASE_DIR=base_dir):
+            etag = self.client.get('/committee/')['ETag']
+            self.assertEqual(self.client.get('/committee/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            # Test modified when the data file changes
+            os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns + 10 ** 9))
+            self.assertEqual(self.client.get('/committee/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_elections(self):
+        user = User.objects.create_user('test')
+        self.client.force_login(user)
+        etag = self.client.get('/portal/elections/')['ETag']
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Test modified when an election opens
+        from election.models import Election
+        Election.objects.create(codename='test', name='Test', has_nomination=False,
+                                voting_start=timezone.now() + timedelta(seconds=1), voting_end=timezone.now() + timedelta(days=1))
+        etag = self.client.get('/portal/elections/')['ETag']
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(seconds=2)):
+            self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Test modified for other users
+        etag = self.client.get('/portal/elections/')['ETag']
+        self.client.force_login(User.objects.create_user('other'))
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_portal_navigation(self):
+        user = User.objects.create_user('fresher01')
+        self.client.force_login(user)
+        etag = self.client.get('/portal/elections/')['ETag']
+
+        # Test not modified when other users' groups change, e.g. on their login
+        other = User.objects.create_user('other')
+        other.groups.add(Group.objects.create(name='committee'))
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Test modified when the user's groups change
+        user.groups.add(Group.objects.get(name='committee'))
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Test modified when the user becomes a fresher, the portal links to Jumpstart
+        from jumpstart.models import Group as JumpstartGroup, Fresher
+        etag = self.client.get('/portal/elections/')['ETag']
+        Fresher.objects.create(username='fresher01', name='Fresher 01', group=JumpstartGroup.objects.create(number=1))
+        self.assertEqual(self.client.get('/portal/elections/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ExportSiteTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def _export(self):
+        stdout = io.StringIO()
+        call_command('exportsite', self.output_dir, stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def test_export_site(self):
+        self.assertIn('Rendered', self._export())
+        file_name = os.path.join(self.output_dir, 'about', 'index.html')
+        with open(file_name, 'rb') as html_file, gzip.open(file_name + '.gz') as gz_file:
+            self.assertEqual(gz_file.read(), html_file.read())
+
+        # Test only pages depending on changed models are rendered again
+        self.assertIn('Rendered 0 page(s)', self._export())
+        Society.objects.create(codename='sucss', short_name='SUCSS', name='Southampton University Computer Science Society', logo='societies/sucss.png')
+        self.assertIn('Rendered 2 page(s)', self._export())
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'societies', 'sucss', 'index.html')))
+
+        # Test pages no longer in the sitemap are removed
+        Society.objects.all().delete()
+        self.assertIn('removed 1', self._export())
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'societies', 'sucss', 'index.html')))
+
+    def test_data_files(self):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        os.makedirs(os.path.join(base_dir, 'website', 'data'))
+        file_name = os.path.join(base_dir, 'website', 'data', 'football-positions.yaml')
+        with open(file_name, 'w') as data_file:
+            data_file.write('positions: []\n')
+
+        with override_settings(BASE_DIR=base_dir):
+            self._export()
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'sports', 'football', 'index.html')))
+            self.assertIn('Rendered 0 page(s)', self._export())
+
+            # Test pages depending on a changed data file are rendered again
+            os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns + 10 ** 9))
+            self.assertIn('Rendered 1 page(s)', self._export())
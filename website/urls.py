@@ -1,6 +1,5 @@
 from django.urls import path, re_path, reverse_lazy
 from django.views.generic.base import RedirectView
-from django.contrib.sitemaps.views import sitemap
 
 from . import views
 from .sitemaps import StaticViewSitemap, CommitteeSitemap, SocietySitemap, SponsorSitemap
@@ -70,5 +69,5 @@ urlpatterns = [
 
     # Meta pages
     path('media-notice/', views.media_notice, name='media-notice'),
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemap.xml', views.sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
 ]
@@ -1,37 +1,22 @@
 from PIL import Image
 import io
+import os
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.exceptions import ValidationError
 
+from .images import open_image, encode_image, UPLOAD_FORMATS
+
 
 def is_committee(user):
     return user.groups.filter(name='committee').exists()
 
 
-def rotate_image(image):
-    """ Rotate an image according to it's EXIF info. """
-
-    try:
-        orientation_tag = 274 # 0x0112
-        exif=dict(image._getexif().items())
-        if exif[orientation_tag] == 3:
-            image = image.rotate(180, expand=True)
-        elif exif[orientation_tag] == 6:
-            image = image.rotate(270, expand=True)
-        elif exif[orientation_tag] == 8:
-            image = image.rotate(90, expand=True)
-    except(AttributeError, KeyError, IndexError):
-        pass
-    return image
-
-
-def reconstruct_image_file(image, filename, image_format):
+def reconstruct_image_file(image, filename, image_format, **options):
     """Reconstruct Django File from PIL image.
        Also strip EXIF data.
     """
-    image_io = io.BytesIO()
-    image.save(image_io, image_format)
-    image_file = InMemoryUploadedFile(image_io, None, filename, image_format, None, None, None)
+    image_io = io.BytesIO(encode_image(image, image_format, **options))
+    image_file = InMemoryUploadedFile(image_io, None, filename, image_format, len(image_io.getvalue()), None, None)
     return image_file
 
 
@@ -40,14 +25,22 @@ def validate_file_size(f, size_limit):
         raise ValidationError('File size too large. File size limited to {}MB.'.format(size_limit))
 
 
-def clean_image(image_file, size_limit=8):
-    """Validate file size, rotate image and strip EXIF data."""
+def clean_image(image_file, size_limit=8, max_dimension=None):
+    """Validate file size, rotate image, scale it down to IMAGE_MAX_DIMENSION and strip EXIF data.
+       Resized copies for srcset are generated in the background once the model is saved.
+    """
 
     if size_limit:
         validate_file_size(image_file, size_limit)
-    image = Image.open(image_file)
+    try:
+        image = open_image(image_file, max_dimension)
+    except (OSError, SyntaxError, Image.DecompressionBombError):
+        raise ValidationError('Upload a valid image. The file you uploaded was either not an image or a corrupted image.')
     filename = image_file.name
     image_format = image.format
-    image = rotate_image(image)
-    image_file = reconstruct_image_file(image, filename, image_format)
+    if image_format not in UPLOAD_FORMATS:
+        image_format = 'JPEG'
+        filename = os.path.splitext(filename)[0] + '.jpg'
+    options = {'quality': 90, 'optimize': True} if image_format == 'JPEG' else {}
+    image_file = reconstruct_image_file(image, filename, image_format, **options)
     return image_file
@@ -1,47 +1,72 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.shortcuts import Http404
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Q, Case, When, Value, IntegerField
+from django.contrib.sitemaps import views as sitemaps_views
 
 from .models import Society, Sponsor, CommitteeRoleMember
+from .caching import cache_public_page, get_or_set_content, get_content_modified
+from .conditional import versions_condition
+from .datafiles import load_data_file
 
-from fbevents.utils import get_upcoming_events
+from fbevents.utils import get_cached_upcoming_events, get_sync_version
+
+
+PREVIOUS_COMMITTEE_FILE = 'website/data/previous-committee.yaml'
+
+FOOTBALL_POSITIONS_FILE = 'website/data/football-positions.yaml'
 
-import os
-import yaml
-import itertools
 
 # Homepage
 
+def _get_upcoming_event_times():
+    # Events drop out of the page when they start or end
+    return [time for event in get_cached_upcoming_events() for time in (event.start_time, event.end_time)]
+
+
+@versions_condition('content', get_sync_version, transitions=_get_upcoming_event_times)
 def home(request):
-    sponsors = itertools.chain(Sponsor.objects.filter(level='gold'), Sponsor.objects.filter(level='silver'), Sponsor.objects.filter(level='bronze'))
+    sponsors_by_level = _get_sponsors()
+    sponsors = sponsors_by_level['gold'] + sponsors_by_level['silver'] + sponsors_by_level['bronze']
 
+    events = get_cached_upcoming_events()
     context = {
         'sponsors': sponsors,
-        'events': get_upcoming_events(),
+        'events': events,
+        # Between syncs the number of upcoming events identifies the rendered events block
+        'events_cache_version': '{}-{}'.format(get_sync_version(), len(events)),
+        'events_cache_timeout': getattr(settings, 'FB_EVENTS_CACHE_TIMEOUT', 3600),
     }
     return render(request, 'website/home.html', context)
 
 
 # Committee
 
+def _get_committee():
+    """Committee role members for the overview and the navigation of the member pages, cached until any of them changes."""
+    return get_or_set_content('committee', lambda: list(CommitteeRoleMember.objects.all()))
+
+@versions_condition('content', files=(PREVIOUS_COMMITTEE_FILE,))
+@cache_public_page(files=(PREVIOUS_COMMITTEE_FILE,))
 def committee_overview(request):
-    committee = CommitteeRoleMember.objects.all()
+    committee = _get_committee()
     try:
-        with open(os.path.join(settings.BASE_DIR, 'website/data/previous-committee.yaml')) as data_file:
-            print("pain")
-            previous_committees = yaml.load(data_file, Loader=yaml.FullLoader)
-    except Exception as e:
-        print(e)
+        previous_committees = load_data_file(PREVIOUS_COMMITTEE_FILE)
+    except OSError:
+        previous_committees = None
     context = {
         'committee': committee,
         'previous_committees': previous_committees,
     }
     return render(request, 'website/committee/committee-overview.html', context)
 
+@versions_condition('content')
+@cache_public_page
 def committee_member(request, role):
-    committee = CommitteeRoleMember.objects.all()
-    committee_role_member = get_object_or_404(CommitteeRoleMember, pk=role)
+    committee = _get_committee()
+    committee_role_member = next((committee_role_member for committee_role_member in committee if committee_role_member.role_codename == role), None)
+    if committee_role_member is None:
+        raise Http404('No committee role matches the given query.')
     context = {
         'committee': committee,
         'current_committee_member': committee_role_member,
@@ -51,16 +76,26 @@ def committee_member(request, role):
 
 # Societies
 
+def _get_societies():
+    """Societies with their links for the overview and the society pages, cached until any of them changes."""
+    return get_or_set_content('societies', lambda: list(Society.objects.prefetch_related('societylink_set')))
+
+@versions_condition('content')
+@cache_public_page
 def societies(request):
-    societies = Society.objects.all()
+    societies = _get_societies()
     context = {
         'societies': societies,
     }
     return render(request, 'website/societies/societies.html', context)
 
+@versions_condition('content')
+@cache_public_page
 def societies_detail(request, society):
-    societies = Society.objects.all()
-    society_obj = get_object_or_404(Society, pk=society)
+    societies = _get_societies()
+    society_obj = next((society_obj for society_obj in societies if society_obj.codename == society), None)
+    if society_obj is None:
+        raise Http404('No society matches the given query.')
     context = {
         'society': society_obj,
         'societies': societies,
@@ -70,78 +105,91 @@ def societies_detail(request, society):
 
 # Sponsors
 
+def _load_sponsors():
+    # One query ordered by level rank, with the links for the sponsor detail pages
+    level_ranks = Case(*[When(level=level, then=Value(rank)) for rank, (level, _) in enumerate(Sponsor.LEVELS)], output_field=IntegerField())
+    sponsors = Sponsor.objects.annotate(level_rank=level_ranks).order_by('level_rank', 'codename').prefetch_related('sponsorlink_set')
+    sponsors_by_level = {level: [] for level, _ in Sponsor.LEVELS}
+    for sponsor in sponsors:
+        sponsors_by_level.setdefault(sponsor.level, []).append(sponsor)
+    return sponsors_by_level
+
+
 def _get_sponsors():
-    gold_sponsors = Sponsor.objects.filter(level='gold')
-    silver_sponsors = Sponsor.objects.filter(level='silver')
-    bronze_sponsors = Sponsor.objects.filter(level='bronze')
-    sixtyfourbit_sponsors = Sponsor.objects.filter(level='64-bit')
-    thirtytwobit_sponsors = Sponsor.objects.filter(level='32-bit')
-    sixteenbit_sponsors = Sponsor.objects.filter(level='16-bit')
+    """Sponsors grouped by level, cached until any sponsor changes."""
+    return get_or_set_content('sponsors', _load_sponsors)
 
-    return gold_sponsors, silver_sponsors, bronze_sponsors, sixtyfourbit_sponsors, thirtytwobit_sponsors, sixteenbit_sponsors
 
+@versions_condition('content')
+@cache_public_page(query_params=('sponsor',))
 def sponsors(request):
+    sponsors_by_level = _get_sponsors()
+    context = {
+        'gold_sponsors': sponsors_by_level['gold'],
+        'silver_sponsors': sponsors_by_level['silver'],
+        'bronze_sponsors': sponsors_by_level['bronze'],
+        '64bit_sponsors': sponsors_by_level['64-bit'],
+        '32bit_sponsors': sponsors_by_level['32-bit'],
+        '16bit_sponsors': sponsors_by_level['16-bit'],
+    }
     if 'sponsor' in request.GET:
-        sponsor = get_object_or_404(Sponsor, pk=request.GET['sponsor'])
-        gold_sponsors, silver_sponsors, bronze_sponsors, sixtyfourbit_sponsors, thirtytwobit_sponsors, sixteenbit_sponsors = _get_sponsors()
-        context = {
-            'gold_sponsors': gold_sponsors,
-            'silver_sponsors': silver_sponsors,
-            'bronze_sponsors': bronze_sponsors,
-            '64bit_sponsors': sixtyfourbit_sponsors,
-            '32bit_sponsors': thirtytwobit_sponsors,
-            '16bit_sponsors': sixteenbit_sponsors,
-            'current_sponsor': sponsor,
-        }
+        sponsor = next((sponsor for level_sponsors in sponsors_by_level.values() for sponsor in level_sponsors if sponsor.codename == request.GET['sponsor']), None)
+        if sponsor is None:
+            raise Http404('No sponsor matches the given query.')
+        context['current_sponsor'] = sponsor
         return render(request, 'website/sponsors/sponsor.html', context)
 
     else:
-        gold_sponsors, silver_sponsors, bronze_sponsors, sixtyfourbit_sponsors, thirtytwobit_sponsors, sixteenbit_sponsors = _get_sponsors()
-        context = {
-            'gold_sponsors': gold_sponsors,
-            'silver_sponsors': silver_sponsors,
-            'bronze_sponsors': bronze_sponsors,
-            '64bit_sponsors': sixtyfourbit_sponsors,
-            '32bit_sponsors': thirtytwobit_sponsors,
-            '16bit_sponsors': sixteenbit_sponsors,
-        }
         return render(request, 'website/sponsors/sponsors.html', context)
 
 # Events
 
+@versions_condition('content')
+@cache_public_page
 def events(request):
     return render(request, 'website/events/events.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def socials(request):
     return render(request, 'website/events/socials.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def gaming_socials(request):
     return render(request, 'website/events/gaming-socials.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def campus_hack_19(request):
     return render(request, 'website/events/campus-hack-19.html')
 
 
 # Welfare
 
+@versions_condition('content')
+@cache_public_page
 def welfare(request):
     return render(request, 'website/welfare.html')
 
 
 # Sports
 
+@versions_condition('content')
+@cache_public_page
 def sports(request):
     return render(request, 'website/sports/sports.html')
 
 
+@versions_condition('content', files=(FOOTBALL_POSITIONS_FILE,))
+@cache_public_page(files=(FOOTBALL_POSITIONS_FILE,))
 def football(request):
     try:
-        with open(os.path.join(settings.BASE_DIR, 'website/data/football-positions.yaml')) as data_file:
-            positions = yaml.load(data_file)
-    except:
+        positions = load_data_file(FOOTBALL_POSITIONS_FILE)
+    except OSError:
         raise Http404()
     context = {
         'positions': positions,
@@ -149,48 +197,73 @@ def football(request):
     return render(request, 'website/sports/football.html', context)
 
 
+@versions_condition('content')
+@cache_public_page
 def netball(request):
     return render(request, 'website/sports/netball.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def running(request):
     return render(request, 'website/sports/running.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def sports_others(request):
     return render(request, 'website/sports/others.html')
 
 
 #  Freshers
 
+@versions_condition('content')
+@cache_public_page
 def jumpstart_2018(request):
     return render(request, 'website/freshers/jumpstart-2018.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def freshers_2019(request):
     return render(request, 'website/freshers/freshers-2019.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def jumpstart_2019(request):
     return render(request, 'website/freshers/jumpstart-2019.html')
 
 
 # About
 
+@versions_condition('content')
+@cache_public_page
 def about(request):
     return render(request, 'website/about.html')
 
 
+@versions_condition('content')
+@cache_public_page
 def contact(request):
     return render(request, 'website/contact.html')
 
 
 # Meta pages
 
+@versions_condition('content')
+@cache_public_page
 def media_notice(request):
     return render(request, 'website/media-notice.html')
 
 
+@versions_condition('content', last_modified=lambda request, sitemaps: get_content_modified())
+@cache_public_page
+def sitemap(request, sitemaps):
+    """Sitemap cached until the content changes, and not sent again to crawlers which have the current one."""
+    return sitemaps_views.sitemap(request, sitemaps)
+
+
 # Error pages
 
 # 404